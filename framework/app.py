@@ -1,7 +1,13 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog
-import matplotlib.pyplot as plt
-from fileHandling import load_signal, save_signal
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import filedialog, messagebox, simpledialog, ttk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from fileHandling import load_signal, save_signal, read_signal_chunks
+from binaryFormat import is_binary_signal
+import numpy as np
 from operations import (
     add_signals,
     subtract_signals,
@@ -10,63 +16,219 @@ from operations import (
     accumulate_signal,
     normalize_signal
 )
-from signals import (Signal,generate_signal,read_gen_file)
+from signals import (Signal,generate_signal,read_gen_file,uniform_axis)
+from plotting import LODPlot
+from history import SignalHistory
+
+_LOAD_CHUNK = 1 << 18  # samples parsed between two checks of the cancel flag (a fraction of a second)
+
+
+class _Cancelled(Exception):
+    """Raised inside a worker that noticed its cancel flag."""
+
+
+def _load_interruptible(path: str, cancel: threading.Event) -> Signal:
+    """
+    load_signal for the worker pool: a text file is parsed chunk by chunk and
+    the load stops at the next chunk once cancel is set. Binary files are only
+    memory mapped, there is nothing to interrupt.
+    """
+    if is_binary_signal(path):
+        return load_signal(path)
+    chunks = read_signal_chunks(path, _LOAD_CHUNK)
+    try:
+        header = next(chunks)
+        parts = []
+        for chunk in chunks:
+            if cancel.is_set():
+                raise _Cancelled()
+            parts.append(chunk)
+    finally:
+        chunks.close()
+
+    x = np.concatenate([np.asarray(c.shared_x()[:c.size()]) for c in parts]) if parts else np.empty(0)
+    axis = uniform_axis(x)
+    return Signal(
+        name=header["name"],
+        signal_type=header["signal_type"],
+        is_periodic=header["is_periodic"],
+        x=axis if axis is not None else x,
+        y=np.concatenate([c.y for c in parts]) if parts else np.empty(0),
+        phase=np.concatenate([c.phase for c in parts]) if header["signal_type"] == 1 and parts else None
+    )
+
 
 class DSPGui:
     def __init__(self, root):
         self.root = root
         self.root.title("DSP Signal Processor")
-        self.root.geometry("460x520")
+        self.root.geometry("1200x720")
         self.signal1 = None
         self.signal2 = None
         self.plot_mode = tk.StringVar(value="discrete")
         self.normalize_mode = tk.StringVar(value="0to1")  # default normalize range
+        self.plots = []
+        self.history = SignalHistory()  # every Signal 1 stage, for undo / redo / compare
+
+        # handlers run on a worker pool, see _run
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        self.tasks = {}                 # slot -> (future, label, on_done, cancel event)
+        self.finished = queue.Queue()   # (slot, future) of finished tasks, filled by the workers
+        self.status = tk.StringVar(value="Ready")
+        self.root.protocol("WM_DELETE_WINDOW", self._close)
+
+        # controls on the left, the embedded plot on the right
+        controls = tk.Frame(root)
+        controls.pack(side=tk.LEFT, fill=tk.Y, padx=10)
+        plot_area = tk.Frame(root)
+        plot_area.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self.figure = Figure(figsize=(8, 4))
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=plot_area)
+        NavigationToolbar2Tk(self.canvas, plot_area).update()
+
+        history_area = tk.Frame(plot_area)
+        history_area.pack(side=tk.BOTTOM, fill=tk.X)
+        history_buttons = tk.Frame(history_area)
+        history_buttons.pack(side=tk.RIGHT, padx=5)
+        tk.Button(history_buttons, text="Undo", command=self.undo).pack(fill=tk.X)
+        tk.Button(history_buttons, text="Redo", command=self.redo).pack(fill=tk.X)
+        tk.Button(history_buttons, text="Compare Selected", command=self.compare_stages).pack(fill=tk.X)
+        self.history_list = tk.Listbox(history_area, height=5, selectmode=tk.EXTENDED)
+        self.history_list.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.history_list.bind("<Double-Button-1>", self.goto_stage)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-        tk.Button(root, text="Load Signal 1", command=self.load_signal1).pack(pady=5)
-        tk.Button(root, text="Load Signal 2", command=self.load_signal2).pack(pady=5)
-        tk.Button(root, text="Save Current Signal", command=self.save_signal).pack(pady=5)
-        tk.Button(root, text="Generate Signal from File", command=self.generate_new_signal).pack(pady=5)
+        tk.Button(controls, text="Load Signal 1", command=self.load_signal1).pack(pady=5)
+        tk.Button(controls, text="Load Signal 2", command=self.load_signal2).pack(pady=5)
+        tk.Button(controls, text="Save Current Signal", command=self.save_signal).pack(pady=5)
+        tk.Button(controls, text="Generate Signal from File", command=self.generate_new_signal).pack(pady=5)
 
-        tk.Label(root, text="Operations", font=('Arial', 12, 'bold')).pack(pady=10)
-        tk.Button(root, text="Add", command=self.add).pack(pady=3)
-        tk.Button(root, text="Subtract", command=self.subtract).pack(pady=3)
-        tk.Button(root, text="Multiply by Constant", command=self.multiply_const).pack(pady=3)
-        tk.Button(root, text="Square", command=self.square).pack(pady=3)
-        tk.Button(root, text="Accumulate", command=self.accumulate).pack(pady=3)
+        tk.Label(controls, text="Operations", font=('Arial', 12, 'bold')).pack(pady=10)
+        tk.Button(controls, text="Add", command=self.add).pack(pady=3)
+        tk.Button(controls, text="Subtract", command=self.subtract).pack(pady=3)
+        tk.Button(controls, text="Multiply by Constant", command=self.multiply_const).pack(pady=3)
+        tk.Button(controls, text="Square", command=self.square).pack(pady=3)
+        tk.Button(controls, text="Accumulate", command=self.accumulate).pack(pady=3)
 
-        tk.Label(root, text="Normalization Range", font=('Arial', 12, 'bold')).pack(pady=10)
-        norm_frame = tk.Frame(root)
+        tk.Label(controls, text="Normalization Range", font=('Arial', 12, 'bold')).pack(pady=10)
+        norm_frame = tk.Frame(controls)
         norm_frame.pack()
         tk.Radiobutton(norm_frame, text="[-1, 1]", variable=self.normalize_mode, value="-1to1").pack(side=tk.LEFT, padx=10)
         tk.Radiobutton(norm_frame, text="[0, 1]", variable=self.normalize_mode, value="0to1").pack(side=tk.LEFT, padx=10)
-        tk.Button(root, text="Normalize", command=self.normalize).pack(pady=5)
+        tk.Button(controls, text="Normalize", command=self.normalize).pack(pady=5)
 
-        tk.Label(root, text="Plot Mode", font=('Arial', 12, 'bold')).pack(pady=10)
-        plot_frame = tk.Frame(root)
+        tk.Label(controls, text="Plot Mode", font=('Arial', 12, 'bold')).pack(pady=10)
+        plot_frame = tk.Frame(controls)
         plot_frame.pack()
         tk.Radiobutton(plot_frame, text="Discrete", variable=self.plot_mode, value="discrete").pack(side=tk.LEFT, padx=10)
         tk.Radiobutton(plot_frame, text="Continuous", variable=self.plot_mode, value="continuous").pack(side=tk.LEFT, padx=10)
 
-        tk.Button(root, text="Plot Signals", command=self.plot_signals).pack(pady=10)
+        tk.Button(controls, text="Plot Signals", command=self.plot_signals).pack(pady=10)
+
+        tk.Label(controls, textvariable=self.status).pack(pady=(10, 0))
+        self.progress = ttk.Progressbar(controls, mode="indeterminate", length=200)
+        self.progress.pack(pady=3)
+        tk.Button(controls, text="Cancel", command=self.cancel_tasks).pack(pady=3)
+        self.root.after(50, self._poll)
+
+    # ===== Background tasks =====
+    def _run(self, slot: str, label: str, func, args: tuple, on_done, reads: tuple = (),
+             cancellable: bool = False):
+        """
+        Run func(*args) on the worker pool. slot names what the task writes
+        ("signal1", "signal2", "save"), only one task per slot runs at a time, and
+        the slots in reads must not be busy either. on_done(result) runs on the
+        Tk thread once the task finishes; errors are shown in a message box.
+        A cancellable func also gets the task's cancel event as its last argument
+        and should stop (raise _Cancelled) soon after it is set.
+        """
+        for busy in (slot,) + reads:
+            if busy in self.tasks:
+                self._show_busy(busy)
+                return
+        cancel = threading.Event()
+        future = self.pool.submit(func, *args, cancel) if cancellable else self.pool.submit(func, *args)
+        self.tasks[slot] = (future, label, on_done, cancel)
+        # workers must not touch Tk: finished futures are handed over through a queue
+        future.add_done_callback(lambda f: self.finished.put((slot, f)))
+        self._update_status()
+
+    def _poll(self):
+        """Deliver finished tasks on the Tk thread."""
+        while not self.finished.empty():
+            slot, future = self.finished.get_nowait()
+            task = self.tasks.get(slot)
+            if task is None or task[0] is not future:
+                continue
+            del self.tasks[slot]
+            self._update_status()
+            if future.cancelled() or task[3].is_set():  # the result of a cancelled task is dropped
+                continue
+            error = future.exception()
+            if error is not None:
+                messagebox.showerror("Error", f"{task[1]} failed: {error}")
+            else:
+                task[2](future.result())
+        self.root.after(50, self._poll)
+
+    def cancel_tasks(self):
+        """
+        Cancel every task. Tasks that haven't started never run, loads stop at
+        their next chunk; operations can't be interrupted inside numpy, they run
+        to the end and their result is discarded. A task keeps its slot until
+        its worker is really done, so cancelled work never piles up beside new tasks.
+        """
+        for future, _, _, cancel in self.tasks.values():
+            cancel.set()
+            future.cancel()
+        self._update_status()
+
+    def _show_busy(self, slot: str):
+        _, label, _, cancel = self.tasks[slot]
+        if cancel.is_set():
+            messagebox.showerror("Busy", f"'{label}' is being cancelled, wait for it to stop.")
+        else:
+            messagebox.showerror("Busy", f"Wait for '{label}' to finish or cancel it.")
+
+    def _update_status(self):
+        if self.tasks:
+            self.status.set(", ".join(label + (" (cancelling)" if cancel.is_set() else "")
+                                      for _, label, _, cancel in self.tasks.values()) + " ...")
+            self.progress.start(15)
+        else:
+            self.status.set("Ready")
+            self.progress.stop()
+
+    def _close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.history.close()
+        self.root.destroy()
 
     # ===== File Handlers =====
     def load_signal1(self):
         path = filedialog.askopenfilename(title="Select Signal 1 File")
         if path:
-            try:
-                self.signal1 = load_signal(path)
-                messagebox.showinfo("Loaded", f"Loaded Signal 1 from {path}")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            self._run("signal1", "Loading Signal 1", _load_interruptible, (path,),
+                      lambda sig: self._set_signal1(sig, "Loaded", f"Loaded Signal 1 from {path}"),
+                      cancellable=True)
 
     def load_signal2(self):
         path = filedialog.askopenfilename(title="Select Signal 2 File")
         if path:
-            try:
-                self.signal2 = load_signal(path)
-                messagebox.showinfo("Loaded", f"Loaded Signal 2 from {path}")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            self._run("signal2", "Loading Signal 2", _load_interruptible, (path,),
+                      lambda sig: self._set_signal2(sig, f"Loaded Signal 2 from {path}"),
+                      cancellable=True)
+
+    def _set_signal1(self, sig: Signal, title: str, message: str):
+        self.signal1 = sig
+        self.history.push(sig, sig.name)
+        self._refresh_history()
+        messagebox.showinfo(title, message)
+
+    def _set_signal2(self, sig: Signal, message: str):
+        self.signal2 = sig
+        messagebox.showinfo("Loaded", message)
 
     def save_signal(self):
         if self.signal1 is None:
@@ -74,24 +236,27 @@ class DSPGui:
             return
         path = filedialog.asksaveasfilename(defaultextension=".txt")
         if path:
-            try:
-                save_signal(self.signal1, path)
-                messagebox.showinfo("Saved", f"Signal saved to {path}")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            self._run("save", "Saving", save_signal, (self.signal1, path),
+                      lambda _: messagebox.showinfo("Saved", f"Signal saved to {path}"),
+                      reads=("signal1",))
 
     # ===== Operations =====
+    def _operation(self, label: str, func, args: tuple, message: str, reads: tuple = ()):
+        """Run an operation on Signal 1 in the background, the result replaces Signal 1."""
+        self._run("signal1", label, func, args,
+                  lambda sig: self._set_signal1(sig, "Result", message), reads)
+
     def add(self):
         if self.signal1 and self.signal2:
-            self.signal1 = add_signals(self.signal1, self.signal2)
-            messagebox.showinfo("Result", "Signals added successfully.")
+            self._operation("Adding", add_signals, (self.signal1, self.signal2),
+                            "Signals added successfully.", reads=("signal2",))
         else:
             messagebox.showerror("Error", "Load both signals first!")
 
     def subtract(self):
         if self.signal1 and self.signal2:
-            self.signal1 = subtract_signals(self.signal1, self.signal2)
-            messagebox.showinfo("Result", "Signals subtracted successfully.")
+            self._operation("Subtracting", subtract_signals, (self.signal1, self.signal2),
+                            "Signals subtracted successfully.", reads=("signal2",))
         else:
             messagebox.showerror("Error", "Load both signals first!")
 
@@ -101,20 +266,19 @@ class DSPGui:
             return
         c = simpledialog.askfloat("Multiply by Constant", "Enter constant:")
         if c is not None:
-            self.signal1 = multiply_signal_byConst(self.signal1, c)
-            messagebox.showinfo("Result", f"Signal multiplied by {c}")
+            self._operation("Multiplying", multiply_signal_byConst, (self.signal1, c),
+                            f"Signal multiplied by {c}")
 
     def square(self):
         if self.signal1:
-            self.signal1 = square_signal(self.signal1)
-            messagebox.showinfo("Result", "Signal squared successfully.")
+            self._operation("Squaring", square_signal, (self.signal1,), "Signal squared successfully.")
         else:
             messagebox.showerror("Error", "Load a signal first!")
 
     def accumulate(self):
         if self.signal1:
-            self.signal1 = accumulate_signal(self.signal1)
-            messagebox.showinfo("Result", "Signal accumulated successfully.")
+            self._operation("Accumulating", accumulate_signal, (self.signal1,),
+                            "Signal accumulated successfully.")
         else:
             messagebox.showerror("Error", "Load a signal first!")
 
@@ -126,9 +290,9 @@ class DSPGui:
             else :
                 mode = "0_to_1"
 
-            self.signal1 = normalize_signal(self.signal1, mode=mode)
             label = "[-1, 1]" if mode == "-1_to_1" else "[0, 1]"
-            messagebox.showinfo("Result", f"Signal normalized to {label}.")
+            self._operation("Normalizing", normalize_signal, (self.signal1, mode),
+                            f"Signal normalized to {label}.")
         else:
             messagebox.showerror("Error", "Load a signal first!")
 
@@ -136,48 +300,91 @@ class DSPGui:
         """Generates a new signal from a text file containing parameters."""
         path = filedialog.askopenfilename(title="Select Signal Parameters File", filetypes=[("Text Files", "*.txt")])
         if path:
-            try:
-                from signals import Signal  # ensure class is available
-                self.signal1 = generate_signal(path)
-                messagebox.showinfo("Generated", f"Signal generated successfully from {path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to generate signal: {e}")
+            self._run("signal1", "Generating", generate_signal, (path,),
+                      lambda sig: self._set_signal1(sig, "Generated",
+                                                    f"Signal generated successfully from {path}"))
 
     def save_gen_signal(self):
-        if self.signal1 is None:
-            messagebox.showerror("Error", "No signal to save!")
+        self.save_signal()
+
+    # ===== History =====
+    def _refresh_history(self):
+        self.history_list.delete(0, tk.END)
+        for i, label in enumerate(self.history.labels()):
+            marker = "> " if i == self.history.position else "  "
+            self.history_list.insert(tk.END, f"{marker}{i}: {label}")
+        self.history_list.see(self.history.position)
+
+    def _history_step(self, step):
+        """Replace Signal 1 with the stage step() returns (undo / redo / goto)."""
+        if "signal1" in self.tasks:
+            self._show_busy("signal1")
             return
-        path = filedialog.asksaveasfilename(defaultextension=".txt")
-        if path:
-            try:
-                save_signal(self.signal1, path)
-                messagebox.showinfo("Saved", f"Signal saved to {path}")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+        try:
+            self.signal1 = step()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self._refresh_history()
+
+    def undo(self):
+        self._history_step(self.history.undo)
+
+    def redo(self):
+        self._history_step(self.history.redo)
+
+    def goto_stage(self, event=None):
+        selection = self.history_list.curselection()
+        if selection:
+            self._history_step(lambda: self.history.goto(selection[0]))
+
+    def compare_stages(self):
+        """Plot the two selected history stages over each other."""
+        selection = self.history_list.curselection()
+        if len(selection) != 2:
+            messagebox.showerror("Error", "Select two history stages to compare!")
+            return
+        i, j = selection
+        a, b = self.history.compare(i, j)
+        self._plot(a, b, f"Stage {i}", f"Stage {j}")
+
     # ===== Plotting =====
     def plot_signals(self):
+        """
+        Plot into the embedded figure. Long signals are drawn decimated to the
+        screen width and re-decimated on zoom / pan (see plotting.py); stems are
+        only drawn when few samples are visible.
+        """
         if not self.signal1:
             messagebox.showerror("Error", "Load at least one signal!")
             return
+        self._plot(self.signal1, self.signal2, "Signal 1", "Signal 2")
 
-        plt.figure(figsize=(8, 4))
+    def _plot(self, first: Signal, second: Signal, first_label: str, second_label: str):
+        for plot in self.plots:
+            plot.remove()
+        self.ax.clear()
         mode = self.plot_mode.get()
+        discrete = mode == "discrete"
 
-        if mode == "discrete":
-            plt.stem(self.signal1.x, self.signal1.y, basefmt=" ", label="Signal 1")
-            if self.signal2:
-                plt.stem(self.signal2.x, self.signal2.y, linefmt='r--', markerfmt='ro', basefmt=" ", label="Signal 2")
-        else:
-            plt.plot(self.signal1.x, self.signal1.y, label="Signal 1")
-            if self.signal2:
-                plt.plot(self.signal2.x, self.signal2.y, label="Signal 2", linestyle='--')
-
-        plt.xlabel("Samples" if mode == "discrete" else "Time")
-        plt.ylabel("Amplitude")
-        plt.legend()
-        plt.title(f"{mode.capitalize()} Signal Plot")
-        plt.grid(True)
-        plt.show()
+        self.plots = [LODPlot(self.ax, first, discrete, label=first_label, color="C0")]
+        if second:
+            self.plots.append(LODPlot(self.ax, second, discrete, label=second_label,
+                                      color="r", linestyle="--"))
+
+        x_ranges = [p.x_range() for p in self.plots]
+        y_ranges = [p.pyramid.bounds() for p in self.plots]
+        y_min, y_max = min(0.0, *(r[0] for r in y_ranges)), max(0.0, *(r[1] for r in y_ranges))
+        margin = (y_max - y_min) * 0.05 or 1.0
+        self.ax.set_ylim(y_min - margin, y_max + margin)
+        self.ax.set_xlim(min(r[0] for r in x_ranges), max(r[1] for r in x_ranges))  # draws the plots
+
+        self.ax.set_xlabel("Samples" if discrete else "Time")
+        self.ax.set_ylabel("Amplitude")
+        self.ax.legend()
+        self.ax.set_title(f"{mode.capitalize()} Signal Plot")
+        self.ax.grid(True)
+        self.canvas.draw_idle()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+"""
+    Asynchronous file I/O :
+
+    asyncio counterparts of load_signal / save_signal for jobs that touch many
+    files. A text load is split in two steps that both run in an executor:
+    reading the file, then parsing it, so while one file is parsed the next
+    ones are already being read from disk. Binary (.dsig) files are only memory
+    mapped and take a single step.
+
+        signals = await gather_load_signals(paths, concurrency=8, budget_bytes=256 * 1024 * 1024)
+        await gather_save_signals(zip(signals, out_paths))
+        signals = load_signals(paths)                      # same thing from synchronous code
+
+    The gather helpers bound both the number of files in progress and the bytes
+    those files hold at once (estimated before the file is opened: twice the
+    text size for a text load, the text plus its parsed values; the sample
+    bytes for a save; nothing for a memory mapped .dsig load). Files are
+    admitted in submission order, a file larger than the whole budget runs
+    alone. Results are returned in submission order.
+"""
+import asyncio
+import os
+import struct
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from signals import Signal
+from binaryFormat import is_binary_signal, load_binary_signal
+from fileHandling import (_GZIP_MAGIC, _finish_load, _parse_text_block, _read_text_block,
+                          save_signal)
+from parseCache import ParseCache
+import numpy as np
+from typing import Iterable, Optional
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+def _load_cost(file_path: str) -> int:
+    """Estimated bytes held while loading file_path (0 if it can't be read, the load reports that)."""
+    try:
+        if is_binary_signal(file_path):
+            return 0
+        size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            if f.read(2) == _GZIP_MAGIC and size >= 4:
+                f.seek(-4, os.SEEK_END)
+                size = struct.unpack("<I", f.read(4))[0]  # uncompressed size (modulo 2**32)
+    except OSError:
+        return 0
+    return 2 * size
+
+
+def _save_cost(signal: Signal) -> int:
+    """Bytes of the samples a save writes out."""
+    columns = 3 if signal.signal_type == 1 else 2
+    return signal.size() * columns * signal.y.itemsize
+
+
+class IOLimiter:
+    """
+    Admits at most concurrency operations and budget_bytes of estimated memory
+    at once, in the order they ask for it:
+
+        async with limiter.hold(nbytes):
+            ...
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, budget_bytes: int = DEFAULT_BUDGET):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.concurrency = concurrency
+        self.budget_bytes = budget_bytes
+        self.active = 0
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+        self._next_ticket = 0   # tickets keep admission in request order
+        self._serving = 0
+        self._abandoned = set()  # tickets done waiting ahead of their turn (cancelled)
+
+    def _admits(self, ticket: int, nbytes: int) -> bool:
+        if ticket != self._serving or self.active >= self.concurrency:
+            return False
+        return self.active == 0 or self.in_flight + nbytes <= self.budget_bytes
+
+    @asynccontextmanager
+    async def hold(self, nbytes: int = 0):
+        async with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            try:
+                await self._condition.wait_for(lambda: self._admits(ticket, nbytes))
+            except BaseException:  # cancelled while waiting, don't block the tickets behind it
+                self._done_waiting(ticket)
+                raise
+            self._done_waiting(ticket)
+            self.active += 1
+            self.in_flight += nbytes
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.active -= 1
+                self.in_flight -= nbytes
+                self._condition.notify_all()
+
+    def _done_waiting(self, ticket: int):
+        # called with the condition held, once ticket was admitted or cancelled
+        self._abandoned.add(ticket)
+        while self._serving in self._abandoned:
+            self._abandoned.discard(self._serving)
+            self._serving += 1
+        self._condition.notify_all()
+
+
+async def async_load_signal(file_path: str, detect_periodicity: bool = False,
+                            cache: Optional[ParseCache] = None, dtype=None,
+                            executor: Optional[Executor] = None) -> Signal:
+    """
+    load_signal without blocking the event loop: the file is read, then parsed,
+    in executor (the loop's default executor if None).
+    """
+    loop = asyncio.get_running_loop()
+    if await loop.run_in_executor(executor, is_binary_signal, file_path):
+        signal = await loop.run_in_executor(executor, load_binary_signal, file_path)
+        if dtype is not None or detect_periodicity:  # a full-array conversion or scan
+            return await loop.run_in_executor(executor, _finish_load, signal, True, dtype, detect_periodicity)
+        return signal
+
+    signal = await loop.run_in_executor(executor, cache.get, file_path) if cache is not None else None
+    if signal is None:
+        block = await loop.run_in_executor(executor, _read_text_block, file_path)
+        parse_dtype = np.float64 if cache is not None else dtype  # as in load_signal
+        signal = await loop.run_in_executor(executor, _parse_text_block, file_path, block, parse_dtype)
+        del block  # the text is not needed while the cache entry is written
+        if cache is not None:
+            await loop.run_in_executor(executor, cache.put, file_path, signal)
+    # a cached signal is float64 and may need a full-array conversion to dtype,
+    # a parsed one already is in dtype (the astype is then free)
+    if detect_periodicity or cache is not None:
+        return await loop.run_in_executor(executor, _finish_load, signal, False, dtype, detect_periodicity)
+    return _finish_load(signal, False, dtype)
+
+
+async def async_save_signal(signal: Signal, file_path: str, executor: Optional[Executor] = None,
+                            **options):
+    """save_signal (same options) run in executor (the loop's default executor if None)."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(executor, lambda: save_signal(signal, file_path, **options))
+
+
+async def gather_load_signals(paths: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY,
+                              budget_bytes: int = DEFAULT_BUDGET, executor: Optional[Executor] = None,
+                              return_exceptions: bool = False, **options) -> list:
+    """
+    Load every file of paths (options as in load_signal) with at most concurrency
+    files and budget_bytes in flight. Returns the signals in the order of paths;
+    with return_exceptions a failed file gives its exception instead of raising.
+    Without an executor a thread pool of concurrency workers is used.
+    """
+    paths = list(paths)
+    limiter = IOLimiter(concurrency, budget_bytes)
+    # estimated up front, so the files queue up for the budget in submission order
+    costs = await asyncio.get_running_loop().run_in_executor(
+        executor, lambda: [_load_cost(p) for p in paths])
+
+    async def _load(pool, item):
+        path, cost = item
+        async with limiter.hold(cost):
+            return await async_load_signal(path, executor=pool, **options)
+
+    return await _gather(_load, list(zip(paths, costs)), concurrency, executor, return_exceptions)
+
+
+async def gather_save_signals(items: Iterable[tuple], concurrency: int = DEFAULT_CONCURRENCY,
+                              budget_bytes: int = DEFAULT_BUDGET, executor: Optional[Executor] = None,
+                              return_exceptions: bool = False, **options) -> list:
+    """
+    Save every (signal, file_path) of items (options as in save_signal) with at most
+    concurrency files and budget_bytes in flight. Returns the paths in submission order.
+    """
+    items = list(items)
+    limiter = IOLimiter(concurrency, budget_bytes)
+
+    async def _save(pool, item):
+        signal, path = item
+        async with limiter.hold(_save_cost(signal)):
+            await async_save_signal(signal, path, executor=pool, **options)
+        return path
+
+    return await _gather(_save, items, concurrency, executor, return_exceptions)
+
+
+async def _gather(func, items: list, concurrency: int, executor: Optional[Executor],
+                  return_exceptions: bool) -> list:
+    pool = executor or ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dsp-io")
+    tasks = [asyncio.ensure_future(func(pool, item)) for item in items]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        # after a failure the other files are abandoned, not left running unobserved
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if executor is None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def load_signals(paths: Iterable[str], **options) -> list:
+    """gather_load_signals for synchronous callers (not from inside a running event loop)."""
+    return asyncio.run(gather_load_signals(paths, **options))
+
+
+def save_signals(items: Iterable[tuple], **options) -> list:
+    """gather_save_signals for synchronous callers (not from inside a running event loop)."""
+    return asyncio.run(gather_save_signals(items, **options))
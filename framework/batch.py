@@ -0,0 +1,224 @@
+"""
+    Headless batch runner :
+
+    Applies one operation to every file matched by a glob and writes one
+    result file per input, spreading the files over a process pool.
+
+        python batch.py "../Inputs/*.txt" square -o ../outputs/batch
+        python batch.py "../Inputs/*.txt" add --other ../Inputs/Signal1.txt -o out
+        python batch.py "../Inputs/*.txt" multiply --const 5 --int-index -o out
+        python batch.py "../sin_cos/*.txt" generate -o out
+
+    Operations on text files are streamed chunk by chunk (normalize reads the
+    file twice: a min/max scan, then the transform), so the memory a worker
+    needs depends on --chunk-size and not on the file size.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from signals import Signal, generate_signal
+from fileHandling import load_signal, save_signal, read_signal_chunks, SignalWriter
+from binaryFormat import BINARY_EXTENSION, is_binary_signal
+from parseCache import ParseCache
+from operations import (
+    add_signals,
+    subtract_signals,
+    multiply_signal_byConst,
+    square_signal,
+    accumulate_signal,
+    normalize_signal,
+    Accumulator,
+    Normalizer,
+    scan_bounds,
+    NORMALIZE_MODES
+)
+
+OPERATIONS = ("add", "subtract", "multiply", "square", "accumulate", "normalize", "generate")
+
+# operations that can be streamed: pointwise ones and the ones with carried state
+_STREAMED = ("add", "subtract", "multiply", "square", "accumulate", "normalize")
+
+
+def _apply(op: str, sig: Signal, other: Signal, job: dict) -> Signal:
+    if op == "add":
+        return add_signals(sig, other)
+    if op == "subtract":
+        return subtract_signals(sig, other)
+    if op == "multiply":
+        return multiply_signal_byConst(sig, job["const"])
+    if op == "square":
+        return square_signal(sig)
+    if op == "accumulate":
+        return accumulate_signal(sig)
+    if op == "normalize":
+        return normalize_signal(sig, mode=job["mode"])
+    raise ValueError(f"Unknown operation '{op}'")
+
+
+def _output_path(path: str, job: dict) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(job["out_dir"], f"{stem}_{job['op']}{job['ext']}")
+
+
+def _stream_file(path: str, out: str, job: dict) -> int:
+    """Apply an operation chunk by chunk. Returns the number of samples written."""
+    stateful = None
+    if job["op"] == "accumulate":
+        stateful = Accumulator()
+    elif job["op"] == "normalize":
+        chunks = read_signal_chunks(path, job["chunk_size"])
+        next(chunks)
+        stateful = Normalizer(job["mode"], scan_bounds(chunks))
+
+    chunks = read_signal_chunks(path, job["chunk_size"])
+    header = next(chunks)
+    others = None
+    is_periodic = header["is_periodic"]
+    if job["op"] in ("add", "subtract"):
+        others = read_signal_chunks(job["other"], job["chunk_size"])
+        other_header = next(others)
+        if other_header["n_samples"] != header["n_samples"]:
+            raise ValueError("Signals must have the same number of samples.")
+        is_periodic = is_periodic or other_header["is_periodic"]
+
+    with SignalWriter(out, header["signal_type"], is_periodic,
+                      float_format=job["float_format"], int_index=job["int_index"]) as writer:
+        for chunk in chunks:
+            if stateful is not None:
+                writer.write(stateful.process(chunk))
+                continue
+            other = next(others) if others is not None else None
+            writer.write(_apply(job["op"], chunk, other, job))
+    return writer.n_samples
+
+
+def _process_file(path: str, job: dict) -> dict:
+    """Worker: run the job on one input file, errors are reported, not raised."""
+    start = time.perf_counter()
+    out = _output_path(path, job)
+    result = {"path": path, "output": out, "samples": 0, "bytes": 0, "error": None}
+    try:
+        result["bytes"] = os.path.getsize(path)
+        op = job["op"]
+        streamable = (op in _STREAMED
+                      and not job["ext"].lower().endswith((BINARY_EXTENSION, ".gz"))
+                      and not is_binary_signal(path)
+                      and not (job["other"] and is_binary_signal(job["other"])))
+        if streamable:
+            result["samples"] = _stream_file(path, out, job)
+        else:
+            if op == "generate":
+                sig = generate_signal(path)
+            else:
+                cache = ParseCache(job["cache_dir"]) if job["cache_dir"] else None
+                other = load_signal(job["other"], cache=cache) if op in ("add", "subtract") else None
+                sig = _apply(op, load_signal(path, cache=cache), other, job)
+            save_signal(sig, out, float_format=job["float_format"], int_index=job["int_index"])
+            result["samples"] = sig.size()
+    except Exception as e:  # one bad file must not stop the batch
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _limit_memory(max_bytes: int):
+    """Pool initializer: cap the address space of a worker (where the OS supports it)."""
+    try:
+        import resource
+    except ImportError:
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def run_batch(pattern: str, op: str, out_dir: str, workers: int = None, other: str = None,
+              const: float = 1.0, mode: str = "-1_to_1", chunk_size: int = 1 << 20,
+              ext: str = ".txt", float_format: str = "%r", int_index: bool = False,
+              max_memory_mb: int = None, cache_dir: str = None) -> list:
+    """
+    Run op over every file matching pattern and return one result dict per file
+    (path, output, samples, bytes, seconds, error), in input order.
+    With cache_dir, loaded files go through a ParseCache kept in that directory.
+    max_memory_mb caps the address space of every worker process (also with one worker).
+    """
+    if op not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{op}'. Use one of {OPERATIONS}.")
+    if op in ("add", "subtract") and not other:
+        raise ValueError(f"'{op}' needs a second signal (other).")
+
+    paths = sorted(glob.glob(pattern))
+    os.makedirs(out_dir, exist_ok=True)
+    job = {"op": op, "out_dir": out_dir, "other": other, "const": const, "mode": mode,
+           "chunk_size": chunk_size, "ext": ext, "float_format": float_format,
+           "int_index": int_index, "cache_dir": cache_dir}
+
+    workers = workers or os.cpu_count() or 1
+    # the memory cap is set in worker processes only, so a capped run always uses a pool
+    if (workers == 1 or len(paths) <= 1) and not max_memory_mb:
+        return [_process_file(p, job) for p in paths]
+
+    initializer, initargs = None, ()
+    if max_memory_mb:
+        initializer, initargs = _limit_memory, (max_memory_mb * 1024 * 1024,)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=initargs) as pool:
+        futures = {pool.submit(_process_file, p, job): p for p in paths}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [results[p] for p in paths]
+
+
+def summarize(results: list, elapsed: float) -> str:
+    """Human readable throughput / failure summary of a batch run."""
+    failed = [r for r in results if r["error"]]
+    samples = sum(r["samples"] for r in results)
+    size = sum(r["bytes"] for r in results)
+    lines = [
+        f"Files     : {len(results)} ({len(results) - len(failed)} ok, {len(failed)} failed)",
+        f"Samples   : {samples}",
+        f"Elapsed   : {elapsed:.3f} s",
+        f"Throughput: {samples / elapsed if elapsed else 0:,.0f} samples/s, "
+        f"{size / 1e6 / elapsed if elapsed else 0:.2f} MB/s in, "
+        f"{len(results) / elapsed if elapsed else 0:.1f} files/s",
+    ]
+    for r in failed:
+        lines.append(f"FAILED {r['path']}: {r['error']}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply one DSP operation to many signal files.")
+    parser.add_argument("inputs", help="glob of input files (quote it), parameter files for 'generate'")
+    parser.add_argument("op", choices=OPERATIONS)
+    parser.add_argument("-o", "--out-dir", required=True)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--other", help="second signal for add / subtract")
+    parser.add_argument("--const", type=float, default=1.0, help="constant for multiply")
+    parser.add_argument("--mode", choices=NORMALIZE_MODES, default="-1_to_1",
+                        help="range for normalize")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="samples per streamed chunk")
+    parser.add_argument("--ext", default=".txt", help="output extension (.txt, .txt.gz or .dsig)")
+    parser.add_argument("--float-format", default="%r")
+    parser.add_argument("--int-index", action="store_true", help="write time indices as integers")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="address space cap per worker")
+    parser.add_argument("--cache-dir", default=None, help="reuse parsed input files through this parse cache")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        results = run_batch(args.inputs, args.op, args.out_dir, args.workers, args.other,
+                            args.const, args.mode, args.chunk_size, args.ext,
+                            args.float_format, args.int_index, args.max_memory_mb,
+                            args.cache_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    print(summarize(results, time.perf_counter() - start))
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+    Benchmark suite :
+
+    Times and measures the peak memory of file I/O, every operation, signal
+    generation and the periodicity check at several signal sizes, and writes
+    the results as JSON. A stored result file serves as the baseline for
+    later runs:
+
+        python benchmark.py run -o baseline.json
+        python benchmark.py run --sizes 1e3 1e5 1e7 --cases add_signals load_signal_text -o new.json
+        python benchmark.py compare baseline.json new.json --threshold 0.25
+
+    Inputs are generated from a fixed seed, so every run measures the same data.
+    Each case is timed --repeat times (min and median per call are reported, fast
+    cases are called in batches of at least 50 ms) and run once more under
+    tracemalloc for its peak memory (numpy allocations included,
+    memory maps are not). compare exits with status 1 when a case got slower
+    or needs more memory than the threshold allows.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from signals import Signal, UniformAxis, generate_signal, validate_is_periodic
+from fileHandling import load_signal, save_signal
+from operations import (
+    add_signals,
+    subtract_signals,
+    multiply_signal_byConst,
+    square_signal,
+    accumulate_signal,
+    normalize_signal
+)
+import numpy as np
+
+DEFAULT_SIZES = (1e3, 1e4, 1e5, 1e6)
+SEED = 12345
+
+
+def _signal(n: int, rng, name: str) -> Signal:
+    return Signal(name=name, x=UniformAxis(0, 1, n), y=rng.standard_normal(n))
+
+
+def _periodic_signal(n: int, rng) -> Signal:
+    period = rng.standard_normal(100)
+    return Signal(name="periodic", x=UniformAxis(0, 1, n), y=np.resize(period, n))
+
+
+def _gen_file(path: str, n: int) -> str:
+    # generate_signal produces one second of samples, so Fs sets the size
+    with open(path, 'w') as f:
+        f.write(f"type = sin\nA = 3\nAnalogFrequency = {n / 10}\nSamplingFrequency = {n}\nPhaseShift = 0.5\n")
+    return path
+
+
+CASES = ("load_signal_text", "load_signal_binary", "save_signal_text", "save_signal_binary",
+         "add_signals", "subtract_signals", "multiply_signal_byConst", "square_signal",
+         "accumulate_signal", "normalize_signal", "generate_signal",
+         "validate_is_periodic", "validate_is_periodic_aperiodic")
+
+
+def _setup(case: str, n: int, rng, work_dir: str):
+    """Prepare the inputs of a case (not timed) and return the timed callable."""
+    if case in ("load_signal_text", "load_signal_binary"):
+        path = os.path.join(work_dir, "in.txt" if case == "load_signal_text" else "in.dsig")
+        save_signal(_signal(n, rng, "a"), path)
+        # touch the samples, a binary file is only memory mapped by load_signal
+        return lambda: load_signal(path).y.sum()
+    if case in ("save_signal_text", "save_signal_binary"):
+        sig = _signal(n, rng, "a")
+        path = os.path.join(work_dir, "out.txt" if case == "save_signal_text" else "out.dsig")
+        return lambda: save_signal(sig, path)
+    if case == "generate_signal":
+        path = _gen_file(os.path.join(work_dir, "gen.txt"), n)
+        return lambda: generate_signal(path)
+    if case == "validate_is_periodic":
+        sig = _periodic_signal(n, rng)
+        return lambda: validate_is_periodic(sig)
+    if case == "validate_is_periodic_aperiodic":
+        sig = _signal(n, rng, "a")
+        return lambda: validate_is_periodic(sig)
+
+    a, b = _signal(n, rng, "a"), _signal(n, rng, "b")
+    if case == "add_signals":
+        return lambda: add_signals(a, b)
+    if case == "subtract_signals":
+        return lambda: subtract_signals(a, b)
+    if case == "multiply_signal_byConst":
+        return lambda: multiply_signal_byConst(a, 2.5)
+    if case == "square_signal":
+        return lambda: square_signal(a)
+    if case == "accumulate_signal":
+        return lambda: accumulate_signal(a)
+    if case == "normalize_signal":
+        return lambda: normalize_signal(a)
+    raise ValueError(f"Unknown benchmark case '{case}'")
+
+
+_MIN_BATCH_S = 0.05  # fast cases are called in batches of at least this long
+
+
+def _measure(func, repeat: int) -> dict:
+    # one untimed warm-up call, then calls per batch chosen so timer noise stays small
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, int(_MIN_BATCH_S / single)) if single < _MIN_BATCH_S else 1
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"min_s": min(times), "median_s": float(np.median(times)), "peak_bytes": peak}
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, cases=None, repeat: int = 5, seed: int = SEED,
+                   log=None) -> dict:
+    """
+    Run the cases (all of CASES by default) at every size and return the report:
+    {"meta": {...}, "results": [{"case", "size", "repeat", "min_s", "median_s",
+    "peak_bytes", "samples_per_s"}, ...]}. Sizes from 1e7 up are timed once.
+    """
+    cases = list(cases or CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases {unknown}. Use any of {list(CASES)}.")
+
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="dsp-bench-")
+    try:
+        for size in sizes:
+            n = int(size)
+            runs = 1 if n >= 10 ** 7 else repeat
+            for case in cases:
+                rng = np.random.default_rng(seed)
+                func = _setup(case, n, rng, work_dir)
+                entry = {"case": case, "size": n, "repeat": runs, **_measure(func, runs)}
+                entry["samples_per_s"] = n / entry["min_s"] if entry["min_s"] else None
+                results.append(entry)
+                if log:
+                    log(f"{case:32s} {n:>11d}  {entry['min_s'] * 1e3:10.3f} ms  "
+                        f"{entry['peak_bytes'] / 1e6:9.2f} MB")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    meta = {
+        "seed": seed,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float = 0.25,
+                    memory_threshold: float = 0.25) -> list:
+    """
+    Compare the (case, size) pairs present in both reports. Returns one row per pair:
+    {"case", "size", "time_ratio", "memory_ratio", "regression"}, regression being
+    True when the min time or the peak memory grew by more than the thresholds.
+    """
+    base = {(r["case"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["size"]))
+        if b is None:
+            continue
+        time_ratio = r["min_s"] / b["min_s"] if b["min_s"] else float("inf")
+        memory_ratio = r["peak_bytes"] / b["peak_bytes"] if b["peak_bytes"] else 1.0
+        rows.append({
+            "case": r["case"],
+            "size": r["size"],
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "regression": time_ratio > 1 + threshold or memory_ratio > 1 + memory_threshold,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the DSP framework.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks and write a JSON report")
+    run.add_argument("--sizes", type=float, nargs="+", default=list(DEFAULT_SIZES),
+                     help="signal sizes in samples (up to 1e8)")
+    run.add_argument("--cases", nargs="+", choices=CASES, default=None)
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--seed", type=int, default=SEED)
+    run.add_argument("-o", "--output", help="JSON report file (default: stdout)")
+
+    compare = commands.add_parser("compare", help="flag regressions against a baseline report")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    compare.add_argument("--memory-threshold", type=float, default=0.25,
+                         help="allowed relative peak memory growth")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        log = (lambda line: print(line, file=sys.stderr))
+        report = run_benchmarks(args.sizes, args.cases, args.repeat, args.seed, log)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text)
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare_reports(baseline, current, args.threshold, args.memory_threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else "ok"
+        print(f"{row['case']:32s} {row['size']:>11d}  time x{row['time_ratio']:6.2f}  "
+              f"memory x{row['memory_ratio']:6.2f}  {flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+    Binary signal container (.dsig) :
+
+    A compact alternative to the text format, loaded with memory mapping so
+    opening a huge signal is almost free until its samples are touched.
+
+    Layout (all integers little endian):
+        8 bytes    magic  b"DSPSIG\\x00\\x01"
+        8 bytes    uint64 length H of the JSON header
+        H bytes    UTF-8 JSON header (metadata + array table)
+        padding    up to the next multiple of ALIGNMENT
+        arrays     x / y / phase, each starting on an ALIGNMENT boundary
+
+    The header holds name, signal_type, is_periodic, sample_rate, period, time_axis, n_samples,
+    an optional implicit axis {"start", "step"} (x = start + step * n, the x
+    array is then not stored) and for every stored array its dtype and offset.
+"""
+import json
+import struct
+from signals import Signal, UniformAxis, uniform_axis
+from profiling import instrumented
+import numpy as np
+from typing import Optional
+
+MAGIC = b"DSPSIG\x00\x01"
+BINARY_EXTENSION = ".dsig"
+ALIGNMENT = 64
+
+_PREFIX = struct.Struct("<8sQ")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def is_binary_signal(file_path: str) -> bool:
+    """True if the file starts with the binary container magic."""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+@instrumented
+def save_binary_signal(signal: Signal, file_path: str, implicit_axis: bool = True):
+    """
+    Write signal to the binary container.
+    With implicit_axis=True a uniformly spaced x is stored as (start, step) only
+    (a signal that already has an implicit axis is never expanded).
+    """
+    n = signal.size()
+    arrays = {}
+    axis = uniform_axis(signal.shared_x()) if implicit_axis else None
+    if axis is None:
+        arrays["x"] = signal.x
+    arrays["y"] = signal.y
+    if signal.signal_type == 1:
+        if signal.phase is None:
+            raise ValueError("Frequency-domain signal must have a 'phase' attribute.")
+        arrays["phase"] = signal.phase
+
+    arrays = {key: np.ascontiguousarray(value, dtype=np.dtype(value.dtype).newbyteorder("<"))
+              for key, value in arrays.items()}
+    for key, value in arrays.items():
+        if len(value) != n:
+            raise ValueError(f"'{key}' has {len(value)} values, expected {n}.")
+
+    header = {
+        "name": signal.name,
+        "signal_type": int(signal.signal_type),
+        "is_periodic": bool(signal.is_periodic),
+        "sample_rate": signal.sample_rate,
+        "period": signal.period,
+        "n_samples": n,
+        "axis": {"start": axis.start, "step": axis.step} if axis is not None else None,
+        "time_axis": ({"start": signal.time_axis.start, "step": signal.time_axis.step,
+                       "count": signal.time_axis.count} if signal.time_axis is not None else None),
+        "arrays": {},
+    }
+
+    # the offsets depend on the header size and the header holds the offsets,
+    # so lay out with a generous guess and grow it until everything fits
+    reserved = 256
+    while True:
+        offset = _align(_PREFIX.size + reserved)
+        for key, value in arrays.items():
+            header["arrays"][key] = {"dtype": value.dtype.str, "offset": offset}
+            offset = _align(offset + value.nbytes)
+        encoded = json.dumps(header).encode("utf-8")
+        if len(encoded) <= reserved:
+            break
+        reserved = len(encoded)
+
+    with open(file_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for key, value in arrays.items():
+            f.write(b"\0" * (header["arrays"][key]["offset"] - f.tell()))
+            f.write(value.data)
+
+
+def read_binary_header(file_path: str) -> dict:
+    """Read and validate the JSON header of a binary signal file."""
+    with open(file_path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError("Truncated binary signal file.")
+        magic, length = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError("Not a binary signal file (bad magic).")
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+@instrumented
+def load_binary_signal(file_path: str, name: Optional[str] = None) -> Signal:
+    """
+    Open a binary signal file. The sample arrays are read-only memory maps
+    of the file, nothing is read from disk until they are accessed.
+    An implicit axis is loaded as a UniformAxis without expanding it.
+    """
+    header = read_binary_header(file_path)
+    n = header["n_samples"]
+
+    def _array(key: str) -> Optional[np.ndarray]:
+        entry = header["arrays"].get(key)
+        if entry is None:
+            return None
+        if n == 0:
+            return np.empty(0, dtype=entry["dtype"])
+        return np.memmap(file_path, dtype=entry["dtype"], mode='r',
+                         offset=entry["offset"], shape=(n,))
+
+    x = _array("x")
+    if x is None:
+        axis = header["axis"]
+        if axis is None:
+            raise ValueError("Binary signal file has neither an x array nor an axis descriptor.")
+        x = UniformAxis(axis["start"], axis["step"], n)
+
+    return Signal(
+        name=header["name"] if name is None else name,
+        signal_type=header["signal_type"],
+        is_periodic=header["is_periodic"],
+        sample_rate=header["sample_rate"],
+        x=x,
+        y=_array("y"),
+        phase=_array("phase"),
+        period=header.get("period"),
+        time_axis=UniformAxis(**header["time_axis"]) if header.get("time_axis") else None
+    )
@@ -0,0 +1,218 @@
+"""
+    Convolution and correlation of signals :
+
+    Linear convolution, cross-correlation and auto-correlation that respect the
+    signals' index axes (the output of a convolution starts at the sum of the
+    input start indices). The method is picked from the input sizes:
+
+        direct      : np.convolve, best when one of the inputs is short
+        fft         : one real FFT of the full output length, O((N+M) log(N+M))
+        overlap_add : the long input is cut into blocks convolved with a cached
+                      kernel spectrum, O(N log M) time; its working memory is
+                      _OVERLAP_ADD_BUDGET (or one block for huge kernels) besides the output
+
+    OverlapAddConvolver applies the same kernel to the chunks of
+    fileHandling.read_signal_chunks, giving the same result as a one-shot convolution.
+"""
+from signals import Signal, UniformAxis, uniform_axis
+import numpy as np
+from typing import Optional
+
+METHODS = ("auto", "direct", "fft", "overlap_add")
+
+_DIRECT_MAX_KERNEL = 64         # kernels up to this length always use np.convolve
+_DIRECT_MAX_WORK = 1 << 20      # ... and so does anything with N * M below this
+_OVERLAP_ADD_RATIO = 8          # N / M from which overlap-add beats one big FFT
+_OVERLAP_ADD_BUDGET = 32 << 20  # bytes of FFT working set for the blocks transformed together
+_BLOCK_BYTES_PER_POINT = 32     # per FFT point of a block: input, spectrum, product, inverse
+
+
+def _next_pow2(n: int) -> int:
+    return 1 << max(n - 1, 0).bit_length()
+
+
+def choose_method(n: int, m: int) -> str:
+    """Convolution method "auto" picks for inputs of n and m samples."""
+    short, long = min(n, m), max(n, m)
+    if short <= _DIRECT_MAX_KERNEL or short * long <= _DIRECT_MAX_WORK:
+        return "direct"
+    if long >= _OVERLAP_ADD_RATIO * short:
+        return "overlap_add"
+    return "fft"
+
+
+def _fft_convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    n_out = len(a) + len(b) - 1
+    nfft = _next_pow2(n_out)
+    return np.fft.irfft(np.fft.rfft(a, nfft) * np.fft.rfft(b, nfft), nfft)[:n_out]
+
+
+def _overlap_add(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Convolve the long array a with the short kernel b block by block."""
+    if len(a) < len(b):
+        a, b = b, a
+    n, m = len(a), len(b)
+    nfft = _next_pow2(8 * m)     # FFT size a few times the kernel keeps the overhead low
+    step = nfft - m + 1          # input samples per block
+    kernel = np.fft.rfft(b, nfft)
+
+    out = np.zeros(n + m - 1)
+    # as many blocks per batched FFT as the working set budget allows (at least one)
+    group = step * max(1, _OVERLAP_ADD_BUDGET // (_BLOCK_BYTES_PER_POINT * nfft))
+    for start in range(0, n, group):
+        chunk = a[start:start + group]
+        n_blocks = -(-len(chunk) // step)
+        blocks = np.zeros((n_blocks, step))
+        blocks.ravel()[:len(chunk)] = chunk
+        conv = np.fft.irfft(np.fft.rfft(blocks, nfft, axis=1) * kernel, nfft, axis=1)
+        for i in range(n_blocks):
+            lo = start + i * step
+            hi = min(lo + nfft, len(out))
+            out[lo:hi] += conv[i, :hi - lo]
+    return out
+
+
+def convolve_arrays(a: np.ndarray, b: np.ndarray, method: str = "auto") -> np.ndarray:
+    """Full linear convolution of two sample arrays (length len(a) + len(b) - 1)."""
+    if method not in METHODS:
+        raise ValueError(f"Invalid method '{method}'. Use one of {METHODS}.")
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    if len(a) == 0 or len(b) == 0:
+        return np.empty(0)
+    if method == "auto":
+        method = choose_method(len(a), len(b))
+    if method == "direct":
+        return np.convolve(a, b)
+    if method == "fft":
+        return _fft_convolve(a, b)
+    return _overlap_add(a, b)
+
+
+def _uniform(sig: Signal) -> UniformAxis:
+    axis = uniform_axis(sig.shared_x())
+    if axis is None:
+        if sig.size() == 1:
+            return UniformAxis(sig.x[0], 1.0, 1)
+        raise ValueError(f"'{sig.name}' needs evenly spaced x values for convolution.")
+    return axis
+
+
+def _common_step(ax1: UniformAxis, ax2: UniformAxis) -> float:
+    # a single sample axis fits any step
+    if ax1.count == 1:
+        return ax2.step
+    if ax2.count == 1 or np.isclose(ax1.step, ax2.step):
+        return ax1.step
+    raise ValueError("Signals must have the same sample spacing.")
+
+
+def convolve_signals(sig: Signal, kernel: Signal, method: str = "auto",
+                     name: str = "Convolved Signal") -> Signal:
+    """
+    Linear convolution sig * kernel. The output index axis starts at the sum of
+    the two start indices and has len(sig) + len(kernel) - 1 samples.
+    """
+    if sig.signal_type != kernel.signal_type:
+        raise ValueError("Signals must be in the same domain (time/frequency).")
+    ax1, ax2 = _uniform(sig), _uniform(kernel)
+    step = _common_step(ax1, ax2)
+    y = convolve_arrays(sig.y, kernel.y, method)
+    return Signal(
+        name=name,
+        signal_type=sig.signal_type,
+        is_periodic=False,
+        sample_rate=sig.sample_rate,
+        x=UniformAxis(ax1.start + ax2.start, step, len(y)),
+        y=y
+    )
+
+
+def correlate_signals(sig1: Signal, sig2: Optional[Signal] = None, method: str = "auto",
+                      normalize: bool = False, name: str = "Correlated Signal") -> Signal:
+    """
+    Linear cross-correlation r[l] = sum_n sig1[n + l] * sig2[n] over every lag
+    where the signals overlap; auto-correlation when sig2 is None.
+    x holds the lags in x units (sig1's position minus sig2's position).
+    normalize divides by sqrt(E1 * E2), giving values in [-1, 1].
+    """
+    if sig2 is None:
+        sig2 = sig1
+    ax2 = _uniform(sig2)
+    # correlation is a convolution with the time reversed second signal
+    reversed2 = Signal(
+        name=sig2.name,
+        signal_type=sig2.signal_type,
+        x=UniformAxis(-ax2.last, ax2.step, ax2.count),
+        y=sig2.y[::-1]
+    )
+    result = convolve_signals(sig1, reversed2, method, name)
+    if normalize:
+        energy = np.sqrt(np.dot(sig1.y, sig1.y) * np.dot(sig2.y, sig2.y))
+        if energy == 0:
+            raise ValueError("Cannot normalize the correlation of a zero signal.")
+        result.y = result.y / energy
+    return result
+
+
+class OverlapAddConvolver:
+    """
+    Convolve a stream of chunks with a fixed kernel, e.g. the chunks from
+    fileHandling.read_signal_chunks. Each call to process() returns the finished
+    output samples for that chunk, flush() returns the trailing len(kernel) - 1
+    samples. Concatenated, the outputs equal convolve_signals on the whole signal.
+
+        conv = OverlapAddConvolver(kernel)
+        for chunk in chunks:
+            writer.write(conv.process(chunk))
+        writer.write(conv.flush())
+    """
+
+    def __init__(self, kernel: Signal, method: str = "auto"):
+        if kernel.size() == 0:
+            raise ValueError("Kernel must have at least one sample.")
+        self.kernel = kernel
+        self.method = method
+        self._kernel_axis = _uniform(kernel)
+        self._tail = np.zeros(kernel.size() - 1)  # overlap carried into the next chunk
+        self._next = None   # x of the next output sample, known after the first chunk
+        self._step = self._kernel_axis.step
+        self._template = kernel  # signal_type / sample_rate of the output
+
+    def process(self, chunk: Signal) -> Signal:
+        """Output samples that no later chunk can change any more (len(chunk) of them)."""
+        if chunk.size() == 0:
+            return self._output(np.empty(0))
+        axis = _uniform(chunk)
+        start = axis.start + self._kernel_axis.start
+        if self._next is None:
+            self._step = _common_step(axis, self._kernel_axis)
+            self._next = start
+            self._template = chunk
+        elif not np.isclose(start, self._next):
+            raise ValueError("Chunks must be consecutive.")
+
+        conv = convolve_arrays(chunk.y, self.kernel.y, self.method)
+        conv[:len(self._tail)] += self._tail
+        n = chunk.size()
+        self._tail = conv[n:]
+        return self._output(conv[:n])
+
+    def flush(self) -> Signal:
+        """The last len(kernel) - 1 samples, once every chunk has been processed."""
+        if self._next is None:
+            return self._output(np.empty(0))
+        out, self._tail = self._tail, np.zeros(0)
+        return self._output(out)
+
+    def _output(self, y: np.ndarray) -> Signal:
+        start = self._next if self._next is not None else 0.0
+        if self._next is not None:
+            self._next = start + self._step * len(y)
+        return Signal(
+            name="Convolved Signal",
+            signal_type=self._template.signal_type,
+            is_periodic=False,
+            sample_rate=self._template.sample_rate,
+            x=UniformAxis(start, self._step, len(y)),
+            y=y
+        )
@@ -0,0 +1,203 @@
+"""
+    Lazy signal expressions :
+
+    Records a chain of the operations in operations.py and evaluates it in one
+    fused pass over fixed size blocks, so normalize(square(a + b) * k) allocates
+    only the output array plus a few block sized temporaries instead of one
+    full size array per step.
+
+        expr = (lazy(a) + b).square() * 5
+        result = expr.normalize("0_to_1").evaluate()
+
+    Results are numerically identical to the eager functions in operations.py,
+    which stay the reference implementation.
+"""
+from signals import Signal
+from operations import _check_mode, _normalize_values, _validate_signals
+import numpy as np
+from typing import Union
+
+DEFAULT_BLOCK_SIZE = 65536
+
+
+class SignalExpr:
+    """
+    A node of a lazy expression. Leaves wrap a Signal, inner nodes hold the
+    operation name, the operand nodes and its parameters.
+    Nothing is computed until evaluate() is called.
+    """
+
+    def __init__(self, op: str, operands: tuple = (), signal: Signal = None,
+                 const: float = None, mode: str = None, name: str = ""):
+        self.op = op
+        self.operands = operands
+        self.signal = signal
+        self.const = const
+        self.mode = mode
+        self.name = name
+
+        # metadata every node shares with its inputs (operations never change x)
+        self.ref = signal if signal is not None else operands[0].ref
+        if signal is not None:
+            self.is_periodic = signal.is_periodic
+        elif op == "add" or op == "subtract":
+            self.is_periodic = any(o.is_periodic for o in operands)
+        else:
+            self.is_periodic = operands[0].is_periodic
+
+    # ===== building =====
+    def __add__(self, other: Union["SignalExpr", Signal]) -> "SignalExpr":
+        other = lazy(other)
+        _validate_signals(self.ref, other.ref)
+        # (a + b) + c is recorded as one n-ary add, the same as add_signals(a, b, c)
+        left = self.operands if self.op == "add" else (self,)
+        return SignalExpr("add", left + (other,), name="Added Signal")
+
+    def __radd__(self, other: Signal) -> "SignalExpr":
+        return lazy(other) + self
+
+    def __sub__(self, other: Union["SignalExpr", Signal]) -> "SignalExpr":
+        other = lazy(other)
+        _validate_signals(self.ref, other.ref)
+        return SignalExpr("subtract", (self, other), name="Subtracted Signal")
+
+    def __rsub__(self, other: Signal) -> "SignalExpr":
+        return lazy(other) - self
+
+    def __mul__(self, const: float) -> "SignalExpr":
+        if isinstance(const, (SignalExpr, Signal)):
+            raise TypeError("Signals can only be multiplied by a constant.")
+        return SignalExpr("multiply", (self,), const=const, name="Multiplied Signal")
+
+    __rmul__ = __mul__
+
+    def square(self) -> "SignalExpr":
+        return SignalExpr("square", (self,), name="Squared Signal")
+
+    def accumulate(self) -> "SignalExpr":
+        return SignalExpr("accumulate", (self,), name="Acc Signal")
+
+    def normalize(self, mode: str = "-1_to_1") -> "SignalExpr":
+        _check_mode(mode)
+        return SignalExpr("normalize", (self,), mode=mode, name=self.name + "Normalized")
+
+    def size(self) -> int:
+        return self.ref.size()
+
+    # ===== evaluation =====
+    def _nodes(self) -> list:
+        """All nodes of the expression in post order (operands before their users)."""
+        order, seen = [], set()
+
+        def visit(node):
+            if id(node) in seen:
+                return
+            seen.add(id(node))
+            for operand in node.operands:
+                visit(operand)
+            order.append(node)
+
+        visit(self)
+        return order
+
+    def _block(self, start: int, stop: int, carries: dict, bounds: dict, memo: dict) -> np.ndarray:
+        """
+        Compute samples [start, stop) of this node, operand blocks are computed on the fly.
+        memo holds the blocks already computed for this range, so a sub expression
+        used more than once is evaluated (and its carry advanced) only once.
+        """
+        if id(self) not in memo:
+            memo[id(self)] = self._compute(start, stop, carries, bounds, memo)
+        return memo[id(self)]
+
+    def _compute(self, start: int, stop: int, carries: dict, bounds: dict, memo: dict) -> np.ndarray:
+        op = self.op
+        if op == "leaf":
+            return self.signal.y[start:stop]
+
+        blocks = [o._block(start, stop, carries, bounds, memo) for o in self.operands]
+        if op == "add":
+            out = blocks[0] + blocks[1]
+            for b in blocks[2:]:
+                out += b
+            return out
+        if op == "subtract":
+            return blocks[0] - blocks[1]
+        if op == "multiply":
+            return blocks[0] * self.const
+        if op == "square":
+            return np.square(blocks[0])
+        if op == "normalize":
+            y_min, y_max = bounds[id(self)]
+            return _normalize_values(blocks[0], y_min, y_max, self.mode)
+        if op == "accumulate":
+            # folding the carry into the first sample keeps the summation order
+            # of a single np.cumsum over the whole signal
+            # (in float64, like accumulate_signal)
+            block = np.array(blocks[0], dtype=np.float64)
+            if len(block):
+                block[0] += carries.get(id(self), 0.0)
+                block = np.cumsum(block)
+                carries[id(self)] = block[-1]
+            return block.astype(blocks[0].dtype, copy=False)
+        raise ValueError(f"Unknown operation '{op}'")
+
+    def _scan_bounds(self, block_size: int, bounds: dict) -> tuple:
+        """(min, max) of this node's samples, computed block by block."""
+        y_min, y_max = np.inf, -np.inf
+        carries = {}
+        n = self.size()
+        for start in range(0, n, block_size):
+            block = self._block(start, min(start + block_size, n), carries, bounds, {})
+            y_min = np.minimum(y_min, np.min(block))
+            y_max = np.maximum(y_max, np.max(block))
+        return y_min, y_max
+
+    def evaluate(self, block_size: int = DEFAULT_BLOCK_SIZE) -> Signal:
+        """
+        Evaluate the expression into a new Signal.
+        Every normalize needs the global min/max of its input, which costs one
+        extra blocked scan of that sub expression; everything else is computed in
+        a single pass, block_size samples at a time.
+        """
+        if block_size <= 0:
+            raise ValueError("block_size must be positive.")
+        if self.op == "leaf":
+            return self.signal
+
+        bounds = {}
+        for node in self._nodes():
+            if node.op == "normalize":
+                y_min, y_max = node.operands[0]._scan_bounds(block_size, bounds)
+                if y_max == y_min:
+                    raise ValueError("Cannot normalize a constant signal.")
+                bounds[id(node)] = (y_min, y_max)
+
+        n = self.size()
+        y = None
+        carries = {}
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = self._block(start, stop, carries, bounds, {})
+            if y is None:
+                y = np.empty(n, dtype=block.dtype)  # dtype follows the promotion of the leaves
+            y[start:stop] = block
+        if y is None:
+            y = np.empty(0, dtype=self.ref.y.dtype)
+
+        return Signal(
+            name=self.name,
+            signal_type=self.ref.signal_type,
+            is_periodic=self.is_periodic,
+            x=self.ref.shared_x(),
+            y=y
+        )
+
+
+def lazy(signal: Union[Signal, SignalExpr]) -> SignalExpr:
+    """Start a lazy expression from a Signal (expressions are returned unchanged)."""
+    if isinstance(signal, SignalExpr):
+        return signal
+    if not isinstance(signal, Signal):
+        raise TypeError(f"Expected a Signal, got {type(signal).__name__}")
+    return SignalExpr("leaf", signal=signal, name=signal.name)
@@ -1,69 +1,428 @@
+import gzip
 import os
-from signals import Signal
+import warnings
+from signals import (Signal, UniformAxis, uniform_axis, detect_period, frozen_axis,
+                     get_default_dtype, get_index_dtype)
+from binaryFormat import BINARY_EXTENSION, is_binary_signal, load_binary_signal, save_binary_signal
+from parseCache import ParseCache
+from profiling import instrumented
 import numpy as np
+from typing import Iterator, Optional
 
-def load_signal(file_path: str) -> Signal:
-    with open(file_path, 'r') as f:
-        lines = [line.strip() for line in f if line.strip()]
-
-    signal_type = int(lines[0])
-    is_periodic = bool(int(lines[1]))
-    n_samples = int(lines[2])
-    data_lines = lines[3:3 + n_samples]
-
-    if signal_type == 0:
-        x_vals, y_vals = [], []
-        for line in data_lines:
-            idx, amp = map(float, line.split())
-            x_vals.append(idx)
-            y_vals.append(amp)
-        return Signal(
-            name=os.path.basename(file_path),
-            signal_type=0,
-            is_periodic=is_periodic,
-            x=np.array(x_vals),
-            y=np.array(y_vals)
-        )
-
-    elif signal_type == 1:
-        freq, amp, phase = [], [], []
-        for line in data_lines:
-            f_val, a_val, p_val = map(float, line.split())
-            freq.append(f_val)
-            amp.append(a_val)
-            phase.append(p_val)
-        return Signal(
-            name=os.path.basename(file_path),
-            signal_type=1,
-            is_periodic=is_periodic,
-            x=np.array(freq),
-            y=np.array(amp),
-            phase=np.array(phase)
-        )
+# number of data columns per sample for each signal type
+_COLUMNS = {0: 2, 1: 3}
+_GZIP_MAGIC = b"\x1f\x8b"
+_WRITE_BLOCK = 65536  # rows formatted (and written) at a time
 
-    else:
+
+def _open_text(file_path: str):
+    """Open a text signal file for reading, transparently handling gzip compressed files."""
+    with open(file_path, 'rb') as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+    return gzip.open(file_path, 'rt') if compressed else open(file_path, 'r')
+
+
+def _read_header(f) -> tuple:
+    """Read the 3 header lines (type, periodic, N), skipping blank lines."""
+    header = []
+    while len(header) < 3:
+        line = f.readline()
+        if not line:
+            raise ValueError("Signal file ended before the 3-line header was complete.")
+        line = line.strip()
+        if line:
+            header.append(line)
+
+    signal_type = int(header[0])
+    is_periodic = bool(int(header[1]))
+    n_samples = int(header[2])
+    if signal_type not in _COLUMNS:
         raise ValueError(f"Unsupported signal type: {signal_type}")
+    return signal_type, is_periodic, n_samples
+
+
+def _scan_rows(text: str, max_rows: int, n_cols: int, first_sample: int = 0) -> tuple:
+    """
+    Find the first max_rows sample rows (non blank lines) of text and check that
+    each of them has n_cols values. Returns (rows found, length of the text prefix
+    holding them); anything after that prefix is never parsed.
+    Values and line ends are located with array operations on the bytes of text.
+    """
+    raw = np.frombuffer(text.encode("latin-1", "replace"), dtype=np.uint8)  # one byte per character
+    space = raw <= 32  # whitespace (and control characters) separate the values
+    starts = ~space
+    starts[1:] &= space[:-1]
+    starts = np.flatnonzero(starts)  # first byte of every value
+    newlines = np.flatnonzero(raw == 10)
+    ends = np.append(np.searchsorted(starts, newlines), len(starts))
+    counts = np.diff(ends, prepend=0)  # values per line, the last entry is the unterminated last line
+
+    rows = np.flatnonzero(counts)[:max_rows]
+    if not len(rows):
+        return 0, 0
+    bad = np.flatnonzero(counts[rows] != n_cols)
+    if len(bad):
+        raise ValueError(f"Expected {n_cols} columns per sample, sample {first_sample + bad[0]} "
+                         f"has {counts[rows[bad[0]]]}.")
+    last = rows[-1]
+    return len(rows), int(newlines[last]) if last < len(newlines) else len(text)
+
+
+def _parse_values(text: str, n_values: int) -> np.ndarray:
+    """Parse the n_values whitespace separated numbers of text into a flat float array."""
+    with warnings.catch_warnings():
+        # older numpy warns on unparsable tokens and returns what it read so far,
+        # newer numpy raises; both end up as the same error
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            values = np.fromstring(text, dtype=float, sep=" ")
+        except ValueError:
+            values = None
+    if values is None or values.size != n_values:
+        raise ValueError("Sample block contains non numeric values.")
+    return values
+
+
+@instrumented
+def _parse_block(text: str, n_samples: int, n_cols: int) -> np.ndarray:
+    """
+    Parse the first n_samples rows of a whitespace separated sample block in
+    one vectorized pass. Tabs, spaces, LF and CRLF are all accepted as separators,
+    every row must have n_cols values and anything after the declared samples
+    is ignored (like the line based reader did).
+    Returns an array of shape (n_samples, n_cols).
+    """
+    if n_samples == 0:
+        return np.empty((0, n_cols))
+    n_rows, end = _scan_rows(text, n_samples, n_cols)
+    if n_rows < n_samples:
+        raise ValueError(f"Header declares {n_samples} samples but only {n_rows} could be read.")
+    return _parse_values(text[:end], n_samples * n_cols).reshape(n_samples, n_cols)
+
+
+@instrumented
+def load_signal(file_path: str, detect_periodicity: bool = False,
+                cache: Optional[ParseCache] = None, dtype=None) -> Signal:
+    """
+    Load a text or binary (.dsig) signal file, the format is detected from the file itself.
+    With detect_periodicity, is_periodic and period are derived from the samples
+    (see detect_period) instead of trusting the header.
+    With a cache (see parseCache.py) parsed text files are reused across runs.
+    Text samples are stored in dtype (default: get_default_dtype()), binary files
+    keep their stored dtype unless dtype is given.
+    """
+    if is_binary_signal(file_path):
+        return _finish_load(load_binary_signal(file_path), True, dtype, detect_periodicity)
+
+    signal = cache.get(file_path) if cache is not None else None
+    if signal is None:
+        # cache entries keep the full float64 parse, whatever dtype this call asks for
+        parse_dtype = np.float64 if cache is not None else dtype
+        signal = _parse_text_block(file_path, _read_text_block(file_path), parse_dtype)
+        if cache is not None:
+            cache.put(file_path, signal)
+    return _finish_load(signal, False, dtype, detect_periodicity)
+
+
+def _read_text_block(file_path: str) -> tuple:
+    """The I/O half of a text load: (signal_type, is_periodic, n_samples, sample block text)."""
+    with _open_text(file_path) as f:
+        signal_type, is_periodic, n_samples = _read_header(f)
+        return signal_type, is_periodic, n_samples, f.read()
+
+
+def _parse_text_block(file_path: str, block: tuple, dtype=None) -> Signal:
+    """The CPU half of a text load: parse a _read_text_block result into a Signal."""
+    signal_type, is_periodic, n_samples, text = block
+    data = _parse_block(text, n_samples, _COLUMNS[signal_type])
+    return _rows_signal(os.path.basename(file_path), signal_type, is_periodic, data, dtype)
+
+
+def _finish_load(signal: Signal, binary: bool, dtype=None, detect_periodicity: bool = False) -> Signal:
+    """Apply the dtype and periodicity options of load_signal to a loaded signal."""
+    if not binary and dtype is None:
+        dtype = get_default_dtype()
+    if dtype is not None:
+        signal = signal.astype(dtype)
+
+    if detect_periodicity:
+        signal.period = detect_period(signal)
+        signal.is_periodic = signal.period is not None
+    return signal
+
+
+@instrumented
+def _rows_signal(name: str, signal_type: int, is_periodic: bool, rows: np.ndarray,
+                 dtype=None) -> Signal:
+    """
+    Build a Signal from parsed (n, columns) rows. The rows are transposed into
+    contiguous columns of dtype (default: get_default_dtype()) once and the Signal
+    adopts them without further copies.
+    An evenly spaced x (the usual 0, 1, 2, ... index) is kept as a UniformAxis.
+    An integer index dtype only applies to time domain x, bin frequencies stay float64.
+    """
+    x = uniform_axis(rows[:, 0])
+    columns = rows[:, 1:].T.astype(dtype if dtype is not None else get_default_dtype(), order="C")
+    if x is None:
+        index_dtype = get_index_dtype()
+        if signal_type != 0 and index_dtype.kind == "i":
+            index_dtype = np.float64
+        x = frozen_axis(rows[:, 0], index_dtype)  # one private copy, adopted as the shared axis
+    return Signal(
+        name=name,
+        signal_type=signal_type,
+        is_periodic=is_periodic,
+        x=x,
+        y=columns[0],
+        phase=columns[1] if signal_type == 1 else None
+    )
+
+
+def _sample_columns(signal: Signal) -> tuple:
+    """
+    Columns written per sample: (x, y) for time domain, (x, y, phase) for frequency domain.
+    x is returned in its stored form, a UniformAxis is sliced block by block when writing.
+    """
+    if signal.signal_type == 0:
+        return signal.shared_x(), signal.y
+    if signal.signal_type == 1:
+        if getattr(signal, "phase", None) is None:
+            raise ValueError("Frequency-domain signal must have a 'phase' attribute.")
+        return signal.shared_x(), signal.y, np.asarray(signal.phase)
+    raise ValueError(f"Unsupported signal type: {signal.signal_type}")
+
+
+def _row_format(columns: tuple, float_format: str = "%r", int_index: bool = False,
+                sep: str = "\t") -> str:
+    """printf style format of one sample row, int_index writes x as an integer."""
+    formats = [float_format] * len(columns)
+    if int_index:
+        x = columns[0]
+        if isinstance(x, UniformAxis):
+            integral = x.start % 1 == 0 and x.step % 1 == 0
+        else:
+            integral = not np.any(x % 1)
+        if not integral:
+            raise ValueError("int_index requires integer valued x samples.")
+        formats[0] = "%d"
+    return sep.join(formats) + "\n"
+
+
+def _shortest_float32(values: np.ndarray) -> np.ndarray:
+    """
+    float64 copy of float32 values in which every value is the shortest decimal
+    that reads back as the same float32, so %r writes 0.1 rather than the
+    0.10000000149011612 of a plain widening. Found by rounding to 1 .. 9
+    significant digits (9 always round trips) and keeping the first that does.
+    """
+    wide = values.astype(np.float64)
+    idx = np.flatnonzero(np.isfinite(wide) & (wide != 0))
+    exponent = np.floor(np.log10(np.abs(wide[idx]))).astype(int)
+    for digits in range(1, 10):
+        if not len(idx):
+            break
+        v = wide[idx]
+        shift = digits - 1 - exponent
+        scale = 10.0 ** np.abs(shift)
+        rounded = np.where(shift >= 0, np.round(v * scale) / scale, np.round(v / scale) * scale)
+        same = rounded.astype(np.float32) == values[idx]
+        wide[idx[same]] = rounded[same]
+        idx, exponent = idx[~same], exponent[~same]
+    return wide
+
+
+def _format_blocks(columns: tuple, row_format: str, float_format: str = "%r") -> Iterator:
+    """
+    Format the sample columns as text, _WRITE_BLOCK rows at a time.
+    Each block is formatted by a single % operation on the repeated row format
+    instead of one f-string per sample. With the default "%r", float32 columns
+    are written with their shortest float32 representation.
+    """
+    n = len(columns[0])
+    for start in range(0, n, _WRITE_BLOCK):
+        parts = [c[start:start + _WRITE_BLOCK] for c in columns]
+        if float_format == "%r":
+            parts = [_shortest_float32(p) if p.dtype == np.float32 else p for p in parts]
+        block = np.column_stack(parts)
+        yield (row_format * len(block)) % tuple(block.ravel().tolist())
 
 
-def save_signal(signal: Signal, file_path: str):
-    
-    with open(file_path, 'w') as f:
+@instrumented
+def _save_text_signal(signal: Signal, file_path: str, float_format: str = "%r",
+                      int_index: bool = False, compress: bool = False, sep: str = "\t"):
+    columns = _sample_columns(signal)
+    row_format = _row_format(columns, float_format, int_index, sep)
+
+    if compress:
+        f = gzip.open(file_path, 'wt', compresslevel=6)
+    else:
+        f = open(file_path, 'w', buffering=1 << 20)
+    with f:
         f.write(f"{signal.signal_type}\n")
         f.write(f"{int(signal.is_periodic)}\n")
-        f.write(f"{len(signal.x)}\n")
-        
-        if signal.signal_type == 0:
-            for xi, yi in zip(signal.x, signal.y):
-                f.write(f"{xi}\t{yi}\n")
-        
-        elif signal.signal_type == 1:
-            if getattr(signal, "phase", None) is None:
-                raise ValueError("Frequency-domain signal must have a 'phase' attribute.")
-            _phase: np.ndarray = np.asarray(signal.phase)
-            for fi, ai, pi in zip(signal.x, signal.y,_phase):
-                f.write(f"{fi}\t{ai}\t{pi}\n")
-        else:
-            raise ValueError(f"Unsupported signal type: {signal.signal_type}")
-    
-    print(f"Signal saved successfully to '{os.path.basename(file_path)}'")
+        f.write(f"{signal.size()}\n")
+        for text in _format_blocks(columns, row_format, float_format):
+            f.write(text)
+
+
+@instrumented
+def save_signal(signal: Signal, file_path: str, float_format: str = "%r",
+                int_index: bool = False, compress: Optional[bool] = None, sep: str = "\t"):
+    """
+    Save signal as text, or in the binary container if file_path ends with .dsig
+
+    float_format : printf style format of the sample values, the default "%r"
+                   writes the shortest representation that reads back exactly
+                   (e.g. "%.6f" or "%.8g" for fixed precision).
+    int_index    : write x as integers (like the reference outputs) for time domain signals.
+    compress     : gzip the text, by default only when file_path ends with .gz
+    sep          : column separator, the reference outputs use a single space.
+    """
+    if file_path.lower().endswith(BINARY_EXTENSION):
+        save_binary_signal(signal, file_path)
+        return
+
+    if compress is None:
+        compress = file_path.lower().endswith(".gz")
+    _save_text_signal(signal, file_path, float_format,
+                      int_index and signal.signal_type == 0, compress, sep)
+
+
+def convert_signal_file(src: str, dst: Optional[str] = None) -> str:
+    """
+    Convert a signal file between the text and binary formats.
+    Text files become .dsig files and .dsig files become .txt files;
+    by default the result is written next to src. Returns the output path.
+    """
+    binary = is_binary_signal(src)
+    if dst is None:
+        dst = os.path.splitext(src)[0] + (".txt" if binary else BINARY_EXTENSION)
+
+    signal = load_signal(src)
+    if binary:
+        _save_text_signal(signal, dst)
+    else:
+        save_binary_signal(signal, dst)
+    return dst
+
+
+# ===== Streaming =====
+# Signals larger than memory are read / written in fixed size chunks.
+# Every chunk is a regular Signal so pointwise operations (add, subtract,
+# multiply, square) can be applied chunk by chunk.
+
+def read_signal_chunks(file_path: str, chunk_size: int = 65536, dtype=None) -> Iterator:
+    """
+    Stream a signal file in blocks of chunk_size samples.
+    The first item yielded is the header metadata as a dict
+    (name, signal_type, is_periodic, n_samples), every following item is a
+    Signal holding the next chunk_size samples (the last one may be shorter)
+    in dtype (default: get_default_dtype()).
+    Memory use depends on chunk_size only, not on the file size.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+
+    with _open_text(file_path) as f:
+        signal_type, is_periodic, n_samples = _read_header(f)
+        header = {"name": os.path.basename(file_path), "signal_type": signal_type,
+                  "is_periodic": is_periodic, "n_samples": n_samples}
+        yield header
+
+        n_cols = _COLUMNS[signal_type]
+        read_size = chunk_size * 32     # characters per read, about one chunk of rows
+        pending = np.empty((0, n_cols)) # parsed rows not yet yielded
+        remaining = n_samples           # samples not yet yielded
+        tail = ""                       # incomplete last line of the previous read
+
+        while remaining > 0:
+            text = f.read(read_size)
+            at_eof = not text
+            text = tail + text
+            if at_eof:
+                tail = ""
+            else:
+                # only parse complete lines, keep the rest for the next read
+                cut = text.rfind("\n") + 1
+                text, tail = text[:cut], text[cut:]
+
+            n_rows, end = _scan_rows(text, remaining - len(pending), n_cols,
+                                     n_samples - remaining + len(pending))
+            if n_rows:
+                values = _parse_values(text[:end], n_rows * n_cols)
+                pending = np.concatenate((pending, values.reshape(n_rows, n_cols)))
+
+            while len(pending) and (len(pending) >= chunk_size or len(pending) == remaining):
+                take = min(chunk_size, len(pending))
+                yield _rows_signal(header["name"], signal_type, is_periodic, pending[:take], dtype)
+                pending = pending[take:]
+                remaining -= take
+
+            if at_eof and remaining > 0:
+                raise ValueError(f"Header declares {n_samples} samples but only "
+                                 f"{n_samples - remaining + len(pending)} could be read.")
+
+
+class SignalWriter:
+    """
+    Incremental writer for the text signal format, the counterpart of read_signal_chunks.
+    The sample count line is written as a fixed width placeholder and
+    patched with the real number of samples on close().
+
+        with SignalWriter(path, signal_type=0) as w:
+            for chunk in chunks:
+                w.write(chunk)
+    """
+
+    _COUNT_WIDTH = 20  # enough digits for any sample count
+
+    def __init__(self, file_path: str, signal_type: int = 0, is_periodic: bool = False,
+                 float_format: str = "%r", int_index: bool = False):
+        if signal_type not in _COLUMNS:
+            raise ValueError(f"Unsupported signal type: {signal_type}")
+
+        self.file_path = file_path
+        self.signal_type = signal_type
+        self.is_periodic = is_periodic
+        self.n_samples = 0
+        self._float_format = float_format
+        self._int_index = int_index and signal_type == 0
+
+        self._f = open(file_path, 'wb', buffering=1 << 20)
+        self._f.write(f"{signal_type}\n{int(is_periodic)}\n".encode())
+        self._count_offset = self._f.tell()
+        self._f.write(b" " * self._COUNT_WIDTH + b"\n")
+
+    @instrumented
+    def write(self, chunk: Signal):
+        """Append the samples of chunk to the file."""
+        if self._f.closed:
+            raise ValueError("Cannot write to a closed SignalWriter.")
+        if chunk.signal_type != self.signal_type:
+            raise ValueError("Chunk domain does not match the writer's signal type.")
+        columns = _sample_columns(chunk)
+        row_format = _row_format(columns, self._float_format, self._int_index)
+        for text in _format_blocks(columns, row_format, self._float_format):
+            self._f.write(text.encode())
+        self.n_samples += chunk.size()
+
+    def close(self):
+        """Fix up the sample count header line and close the file."""
+        if self._f.closed:
+            return
+        self._f.seek(self._count_offset)
+        self._f.write(str(self.n_samples).ljust(self._COUNT_WIDTH).encode())
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
 
+if __name__ == "__main__":
+    # python fileHandling.py ../Inputs/*.txt ../outputs/*/*.txt
+    import sys
+    for path in sys.argv[1:]:
+        print(f"{path} -> {convert_signal_file(path)}")
@@ -0,0 +1,285 @@
+"""
+    Filters :
+
+    FIR filters (windowed-sinc design, moving average, derivative) and IIR
+    filters made of biquad sections. Every filter object keeps its state between
+    calls, so a long signal can be filtered chunk by chunk (e.g. the chunks of
+    fileHandling.read_signal_chunks) with the same result as filtering it in one go:
+
+        lp = fir_design("lowpass", 50, num_taps=101, fs=1000)
+        for chunk in chunks:
+            writer.write(lp.process(chunk))
+
+    All filtering is vectorized, there is no per-sample Python loop:
+    FIR filters convolve each block with the taps, IIR sections use a blocked
+    state-space form (a few small matrix products per block of samples).
+"""
+from abc import ABC, abstractmethod
+from signals import Signal
+from convolution import convolve_arrays
+import numpy as np
+from typing import Optional
+
+WINDOWS = ("rectangular", "hann", "hamming", "blackman")
+FIR_KINDS = ("lowpass", "highpass", "bandpass", "bandstop")
+BIQUAD_KINDS = ("lowpass", "highpass", "bandpass", "notch")
+
+
+class _BlockFilter(ABC):
+    """Common Signal handling of the stateful filters."""
+
+    @abstractmethod
+    def process_block(self, x: np.ndarray) -> np.ndarray:
+        """Filter the next block of samples, continuing from the kept state."""
+
+    @abstractmethod
+    def reset(self):
+        """Forget the kept state, the next block starts from zero initial conditions."""
+
+    def process(self, sig: Signal, name: Optional[str] = None) -> Signal:
+        """Filter the samples of sig (a whole signal or the next chunk of one)."""
+        return Signal(
+            name=name if name is not None else sig.name + " Filtered",
+            signal_type=sig.signal_type,
+            is_periodic=sig.is_periodic,
+            sample_rate=sig.sample_rate,
+            x=sig.shared_x(),
+            y=self.process_block(sig.y)
+        )
+
+
+# ===== FIR =====
+
+class FIRFilter(_BlockFilter):
+    """
+    Causal FIR filter y[n] = sum_k taps[k] x[n - k].
+    The last len(taps) - 1 inputs are kept between blocks. With method="direct"
+    (the default) chunked output is bit-identical to one-shot filtering; "auto"
+    lets long filters use the FFT methods of convolution.py (equal to rounding).
+    """
+
+    def __init__(self, taps, method: str = "direct"):
+        self.taps = np.asarray(taps, dtype=float)
+        if self.taps.ndim != 1 or len(self.taps) == 0:
+            raise ValueError("FIR taps must be a non-empty 1-D sequence.")
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        self._history = np.zeros(len(self.taps) - 1)
+
+    def process_block(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if len(x) == 0:
+            return np.empty(0)
+        m = len(self.taps) - 1
+        extended = np.concatenate((self._history, x))
+        y = convolve_arrays(extended, self.taps, self.method)[m:m + len(x)]
+        self._history = extended[len(extended) - m:] if m else self._history
+        return y
+
+
+def _window(name: str, n: int) -> np.ndarray:
+    if name == "rectangular":
+        return np.ones(n)
+    if name == "hann":
+        return np.hanning(n)
+    if name == "hamming":
+        return np.hamming(n)
+    if name == "blackman":
+        return np.blackman(n)
+    raise ValueError(f"Unknown window '{name}'. Use one of {WINDOWS}.")
+
+
+def _lowpass_taps(fc: float, num_taps: int) -> np.ndarray:
+    """Ideal low-pass impulse response (cutoff fc in cycles/sample) centred on the taps."""
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    return 2 * fc * np.sinc(2 * fc * n)
+
+
+def fir_design(kind: str, cutoff, num_taps: int = 101, fs: Optional[float] = None,
+               window: str = "hamming", method: str = "direct") -> FIRFilter:
+    """
+    Windowed-sinc FIR design.
+    kind   : lowpass / highpass (cutoff is one frequency) or
+             bandpass / bandstop (cutoff is a (low, high) pair)
+    cutoff : in Hz when fs is given, otherwise in cycles/sample (0 .. 0.5)
+    num_taps must be odd for highpass and bandstop (they need a centre tap).
+    """
+    if kind not in FIR_KINDS:
+        raise ValueError(f"Unknown filter kind '{kind}'. Use one of {FIR_KINDS}.")
+    if num_taps < 1:
+        raise ValueError("num_taps must be positive.")
+    if kind in ("highpass", "bandstop") and num_taps % 2 == 0:
+        raise ValueError(f"A {kind} FIR needs an odd number of taps.")
+
+    edges = np.atleast_1d(np.asarray(cutoff, dtype=float))
+    if fs is not None:
+        edges = edges / fs
+    expected = 1 if kind in ("lowpass", "highpass") else 2
+    if len(edges) != expected:
+        raise ValueError(f"A {kind} filter needs {expected} cutoff frequenc{'y' if expected == 1 else 'ies'}.")
+    if np.any(edges <= 0) or np.any(edges >= 0.5):
+        raise ValueError("Cutoff frequencies must lie between 0 and the Nyquist frequency.")
+
+    impulse = np.zeros(num_taps)
+    impulse[(num_taps - 1) // 2] = 1.0
+    if kind == "lowpass":
+        taps = _lowpass_taps(edges[0], num_taps)
+    elif kind == "highpass":
+        taps = impulse - _lowpass_taps(edges[0], num_taps)
+    else:
+        low, high = np.sort(edges)
+        taps = _lowpass_taps(high, num_taps) - _lowpass_taps(low, num_taps)
+        if kind == "bandstop":
+            taps = impulse - taps
+
+    taps = taps * _window(window, num_taps)
+    # unity gain in the middle of the pass band
+    if kind in ("lowpass", "bandstop"):
+        taps /= np.sum(taps)
+    elif kind == "highpass":
+        taps /= np.sum(taps * (-1.0) ** np.arange(num_taps))
+    else:
+        centre = np.mean(edges)
+        gain = np.abs(np.sum(taps * np.exp(-2j * np.pi * centre * np.arange(num_taps))))
+        taps /= gain
+    return FIRFilter(taps, method)
+
+
+def moving_average(width: int) -> FIRFilter:
+    """Causal moving average over the last width samples."""
+    if width < 1:
+        raise ValueError("width must be positive.")
+    return FIRFilter(np.full(width, 1.0 / width))
+
+
+def derivative(order: int = 1) -> FIRFilter:
+    """
+    Causal difference filters:
+    order 1 : y[n] = x[n] - x[n-1]
+    order 2 : y[n] = x[n] - 2 x[n-1] + x[n-2]
+    """
+    if order == 1:
+        return FIRFilter([1.0, -1.0])
+    if order == 2:
+        return FIRFilter([1.0, -2.0, 1.0])
+    raise ValueError("Only first and second derivatives are supported.")
+
+
+# ===== IIR =====
+
+class _BiquadSection:
+    """
+    One second order section in state-space form (transposed direct form II):
+        y[n]   = C s[n] + D x[n]
+        s[n+1] = A s[n] + B x[n]
+    For a block of L samples the outputs are y = T x + O s0 and the final state
+    is A^L s0 + K x, so a block costs two small matrix products.
+    """
+
+    def __init__(self, b0, b1, b2, a0, a1, a2):
+        if a0 == 0:
+            raise ValueError("a0 of a biquad section can't be 0.")
+        b0, b1, b2, a1, a2 = b0 / a0, b1 / a0, b2 / a0, a1 / a0, a2 / a0
+        self.coefficients = (b0, b1, b2, 1.0, a1, a2)
+        self.A = np.array([[-a1, 1.0], [-a2, 0.0]])
+        self.B = np.array([b1 - a1 * b0, b2 - a2 * b0])
+        self.C = np.array([1.0, 0.0])
+        self.D = b0
+        self._blocks = {}
+
+    def block_matrices(self, L: int) -> tuple:
+        """(T, O, K, A^L) for blocks of L samples, cached per length."""
+        if L not in self._blocks:
+            powers = [np.eye(2)]
+            for _ in range(L):
+                powers.append(powers[-1] @ self.A)
+            O = np.array([self.C @ powers[n] for n in range(L)])             # (L, 2)
+            impulse = np.array([self.C @ powers[n] @ self.B for n in range(L)])  # h[1..L]
+            T = np.zeros((L, L))
+            for k in range(L):
+                T[k, k] = self.D
+                T[k + 1:, k] = impulse[:L - k - 1]
+            K = np.array([powers[L - 1 - k] @ self.B for k in range(L)]).T    # (2, L)
+            self._blocks[L] = (T, O, K, powers[L])
+        return self._blocks[L]
+
+
+class BiquadFilter(_BlockFilter):
+    """
+    IIR filter made of cascaded biquad sections, each row of sections being
+    (b0, b1, b2, a0, a1, a2) of  H(z) = (b0 + b1 z^-1 + b2 z^-2) / (a0 + a1 z^-1 + a2 z^-2).
+    The state of every section is kept between blocks; chunked output equals
+    one-shot filtering up to floating point rounding.
+    """
+
+    BLOCK = 128  # samples per state-space block
+
+    def __init__(self, sections):
+        sections = np.atleast_2d(np.asarray(sections, dtype=float))
+        if sections.shape[1] != 6:
+            raise ValueError("Each biquad section needs 6 coefficients (b0, b1, b2, a0, a1, a2).")
+        self.sections = [_BiquadSection(*row) for row in sections]
+        self.reset()
+
+    def reset(self):
+        self._states = [np.zeros(2) for _ in self.sections]
+
+    def process_block(self, x: np.ndarray) -> np.ndarray:
+        y = np.asarray(x, dtype=float)
+        for i, section in enumerate(self.sections):
+            y, self._states[i] = self._run_section(section, y, self._states[i])
+        return y
+
+    def _run_section(self, section: _BiquadSection, x: np.ndarray, state: np.ndarray) -> tuple:
+        n = len(x)
+        L = self.BLOCK
+        n_full = n // L
+        y = np.empty(n)
+
+        if n_full:
+            T, O, K, AL = section.block_matrices(L)
+            X = x[:n_full * L].reshape(n_full, L)
+            zero_state = X @ T.T            # each block filtered from a zero state
+            drive = X @ K.T                 # state each block leaves behind from a zero state
+            starts = np.empty((n_full, 2))
+            for b in range(n_full):         # one 2x2 step per block, not per sample
+                starts[b] = state
+                state = AL @ state + drive[b]
+            y[:n_full * L] = (zero_state + starts @ O.T).ravel()
+
+        rest = n - n_full * L
+        if rest:
+            T, O, K, AL = section.block_matrices(rest)
+            tail = x[n_full * L:]
+            y[n_full * L:] = T @ tail + O @ state
+            state = AL @ state + K @ tail
+        return y, state
+
+
+def biquad_design(kind: str, f0: float, q: float = 1 / np.sqrt(2), fs: Optional[float] = None) -> BiquadFilter:
+    """
+    Single biquad section from the RBJ audio EQ cookbook.
+    f0 in Hz when fs is given, otherwise in cycles/sample; q sets the bandwidth.
+    """
+    if kind not in BIQUAD_KINDS:
+        raise ValueError(f"Unknown filter kind '{kind}'. Use one of {BIQUAD_KINDS}.")
+    f = f0 / fs if fs is not None else f0
+    if not 0 < f < 0.5:
+        raise ValueError("f0 must lie between 0 and the Nyquist frequency.")
+    if q <= 0:
+        raise ValueError("q must be positive.")
+
+    w0 = 2 * np.pi * f
+    cos_w0, alpha = np.cos(w0), np.sin(w0) / (2 * q)
+    a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    if kind == "lowpass":
+        b = ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2)
+    elif kind == "highpass":
+        b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    elif kind == "bandpass":
+        b = (alpha, 0.0, -alpha)
+    else:
+        b = (1.0, -2 * cos_w0, 1.0)
+    return BiquadFilter([b + a])
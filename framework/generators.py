@@ -0,0 +1,189 @@
+"""
+    Tone bank generator :
+
+    Generates many sin/cos tones from one parameter file in batched, vectorized
+    computations. The file uses the same "key = value" lines as the single
+    signal files of generate_signal, with one "tone" line per tone:
+
+        SamplingFrequency = 8000
+        Duration = 1.5                      # seconds, default for every tone (1 if omitted)
+        tone = sin, 3, 360, 1.96349540849362
+        tone = cos, 1, 100, 0, 0.5          # optional 5th field: duration of this tone
+        tone = sin, 2, 50, 0, 1, chord      # optional 6th field: group, tones of a
+        tone = cos, 2, 75, 0, 1, chord      #   group are summed into one signal
+
+    tone fields are: type, A, AnalogFrequency, PhaseShift [, Duration [, Group]].
+    A plain generate_signal parameter file (type / A / AnalogFrequency / ...) is
+    read as a bank with a single tone.
+
+    Tones shorter than the longest one are zero after their duration. Samples are
+    computed block by block, so iter_tone_bank keeps memory flat for very long
+    signals, and the same per-sample formula as generate_signal is used.
+"""
+import os
+from signals import Signal, UniformAxis, get_default_dtype
+import numpy as np
+from typing import Iterator, Optional
+
+_BLOCK_VALUES = 1 << 22  # tone x sample values computed per block (32 MB of float64)
+
+
+def read_tone_bank(file_path: str) -> dict:
+    """
+    Read a tone bank parameter file into a dict of per-tone arrays:
+    type, A, F, theta, duration, group (+ the scalar Fs).
+    """
+    params, tones = {}, []
+    with open(file_path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line or '=' not in line:
+                continue
+            key, value = (part.strip() for part in line.split('=', 1))
+            if key.lower() == "tone":
+                tones.append([v.strip() for v in value.split(',')])
+            else:
+                params[key] = value
+
+    duration = float(params.get("Duration", 1.0))
+    if not tones:
+        # single signal file, as read by read_gen_file
+        if "type" not in params:
+            raise ValueError(f"'{os.path.basename(file_path)}' defines no tones.")
+        tones.append([params["type"], params.get("A", 1.0), params.get("AnalogFrequency", 1.0),
+                      params.get("PhaseShift", 0.0)])
+
+    bank = {"type": [], "A": [], "F": [], "theta": [], "duration": [], "group": []}
+    for i, fields in enumerate(tones):
+        if not 4 <= len(fields) <= 6:
+            raise ValueError(f"tone {i + 1}: expected type, A, F, PhaseShift [, Duration [, Group]]")
+        kind = str(fields[0]).lower()
+        if kind not in ("sin", "cos"):
+            raise ValueError(f"Unknown signal type '{kind}'")
+        bank["type"].append(kind)
+        bank["A"].append(float(fields[1]))
+        bank["F"].append(float(fields[2]))
+        bank["theta"].append(float(fields[3]))
+        bank["duration"].append(float(fields[4]) if len(fields) > 4 and fields[4] else duration)
+        bank["group"].append(fields[5] if len(fields) > 5 else None)
+
+    for key in ("A", "F", "theta", "duration"):
+        bank[key] = np.array(bank[key])
+    bank["type"] = np.array(bank["type"])
+    F_max = np.max(bank["F"])
+    bank["Fs"] = float(params.get("SamplingFrequency", 2 * F_max))
+    if bank["Fs"] < 2 * F_max:
+        raise ValueError(f"Sampling frequency {bank['Fs']} Hz is below Nyquist rate for F={F_max} Hz")
+    return bank
+
+
+def _tone_lengths(bank: dict) -> np.ndarray:
+    """Samples per tone, the length np.arange(0, duration, 1 / Fs) would have."""
+    return np.ceil(bank["duration"] / (1 / bank["Fs"])).astype(np.int64)
+
+
+def _bank_block(bank: dict, start: int, stop: int, dtype) -> np.ndarray:
+    """Samples [start, stop) of every tone as a (n_tones, stop - start) array."""
+    t = np.arange(start, stop) * (1 / bank["Fs"])
+    out = np.zeros((len(bank["A"]), stop - start), dtype=dtype)
+    for kind, func in (("sin", np.sin), ("cos", np.cos)):
+        rows = np.flatnonzero(bank["type"] == kind)
+        if len(rows):
+            phase = (2 * np.pi * bank["F"][rows])[:, None] * t + bank["theta"][rows][:, None]
+            out[rows] = bank["A"][rows][:, None] * func(phase)
+    # silence tones whose duration ended before this block
+    out[np.arange(stop - start) + start >= _tone_lengths(bank)[:, None]] = 0
+    return out
+
+
+def iter_tone_bank(bank: dict, chunk_size: Optional[int] = None, dtype=None,
+                   summed: bool = True) -> Iterator:
+    """
+    Generate the bank chunk by chunk (memory depends on chunk_size, not on the duration).
+    summed=True yields Signal chunks of the sum of all tones, otherwise
+    (n_tones, chunk) arrays of the individual tones.
+    dtype defaults to get_default_dtype(), like every dtype argument below.
+    """
+    dtype = dtype if dtype is not None else get_default_dtype()
+    n_tones = len(bank["A"])
+    n = int(np.max(_tone_lengths(bank))) if n_tones else 0
+    if chunk_size is None:
+        chunk_size = max(1, _BLOCK_VALUES // max(n_tones, 1))
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        block = _bank_block(bank, start, stop, dtype)
+        if not summed:
+            yield block
+            continue
+        yield Signal(
+            name="Tone Bank",
+            signal_type=0,
+            sample_rate=bank["Fs"],
+            x=UniformAxis(start, 1, stop - start),
+            y=np.sum(block, axis=0, dtype=dtype)
+        )
+
+
+def tone_bank_array(bank: dict, dtype=None) -> np.ndarray:
+    """All tones as one (n_tones, n_samples) array, n_samples being the longest tone."""
+    dtype = dtype if dtype is not None else get_default_dtype()
+    n_tones = len(bank["A"])
+    n = int(np.max(_tone_lengths(bank))) if n_tones else 0
+    out = np.empty((n_tones, n), dtype=dtype)
+    chunk = max(1, _BLOCK_VALUES // max(n_tones, 1))
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        out[:, start:stop] = _bank_block(bank, start, stop, dtype)
+    return out
+
+
+def tone_bank_signals(bank: dict, dtype=None) -> list:
+    """
+    One Signal per group (the sum of its tones) and per ungrouped tone, in file order.
+    Each signal is as long as its longest tone.
+    """
+    tones = tone_bank_array(bank, dtype)
+    lengths = _tone_lengths(bank)
+    order, members = [], {}
+    for i, group in enumerate(bank["group"]):
+        key = group if group is not None else i
+        if key not in members:
+            order.append(key)
+            members[key] = []
+        members[key].append(i)
+
+    signals = []
+    for key in order:
+        rows = members[key]
+        n = int(np.max(lengths[rows]))
+        if isinstance(key, str):
+            name = key
+        else:
+            kind = "Sine" if bank["type"][key] == "sin" else "Cosine"
+            name = f"{kind}_{bank['F'][key]}Hz"
+        signals.append(Signal(
+            name=name,
+            signal_type=0,
+            sample_rate=bank["Fs"],
+            x=UniformAxis(0, 1, n),
+            y=np.sum(tones[rows, :n], axis=0, dtype=dtype)
+        ))
+    return signals
+
+
+def generate_tone_bank(file_path: str, summed: bool = False, dtype=None):
+    """
+    Generate every tone of a parameter file: a list of Signals (see tone_bank_signals),
+    or with summed=True a single Signal holding the sum of all tones.
+    """
+    bank = read_tone_bank(file_path)
+    if not summed:
+        return tone_bank_signals(bank, dtype)
+    dtype = dtype if dtype is not None else get_default_dtype()
+    n = int(np.max(_tone_lengths(bank))) if len(bank["A"]) else 0
+    y = np.empty(n, dtype=dtype)
+    for chunk in iter_tone_bank(bank, dtype=dtype):
+        start = int(chunk.axis.start)
+        y[start:start + chunk.size()] = chunk.y
+    return Signal(name=os.path.basename(file_path), signal_type=0, sample_rate=bank["Fs"],
+                  x=UniformAxis(0, 1, n), y=y)
@@ -0,0 +1,154 @@
+"""
+    Signal history :
+
+    Keeps every intermediate signal of a session (load, add, square, ...) for
+    undo / redo and for comparing any two stages. Recent entries stay in memory;
+    once they exceed the memory budget the oldest ones are written to a
+    temporary binary (.dsig) store and dropped from memory. A spilled entry is
+    brought back as a memory map of its file, so reading an old stage costs a
+    file open, not a reparse or a recomputation.
+
+        history = SignalHistory(budget_bytes=512 * 1024 * 1024)
+        history.push(sig, "Loaded Signal1.txt")
+        history.push(square_signal(sig), "Square")
+        previous = history.undo()
+"""
+import os
+import shutil
+import tempfile
+from signals import Signal, UniformAxis
+from binaryFormat import BINARY_EXTENSION, load_binary_signal, save_binary_signal
+import numpy as np
+from typing import Optional
+
+DEFAULT_BUDGET = 512 * 1024 * 1024
+
+
+def _memory_bytes(signal: Signal) -> int:
+    """Bytes held in memory by the sample arrays of signal (memory maps count as 0)."""
+    total = 0
+    for values in (signal.shared_x(), signal.y, signal.phase):
+        if values is None or isinstance(values, UniformAxis):
+            continue
+        base = values
+        while isinstance(base, np.ndarray) and not isinstance(base, np.memmap):
+            base = base.base
+        if not isinstance(base, np.memmap):
+            total += values.nbytes
+    return total
+
+
+class SignalHistory:
+    """
+    Linear undo history of signals. push() adds a stage after the current one
+    (dropping any stages that could have been redone), undo() / redo() move the
+    current position, get(i) returns any stage.
+    Stages beyond budget_bytes of memory are spilled to spill_dir (a temporary
+    directory by default, removed by close()).
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET, spill_dir: Optional[str] = None):
+        self.budget_bytes = budget_bytes
+        self._own_dir = spill_dir is None
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="dsp-history-")
+        self._entries = []      # dicts: label, signal, path (set once spilled), nbytes (in memory)
+        self._counter = 0       # unique spill file names
+        self.position = -1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def labels(self) -> list:
+        return [entry["label"] for entry in self._entries]
+
+    def memory_bytes(self) -> int:
+        """Memory held by the stages that are not spilled."""
+        return sum(entry["nbytes"] for entry in self._entries if entry["path"] is None)
+
+    def push(self, signal: Signal, label: str) -> int:
+        """Add signal as the stage after the current one and make it current. Returns its index."""
+        for entry in self._entries[self.position + 1:]:
+            self._discard(entry)
+        del self._entries[self.position + 1:]
+        self._entries.append({"label": label, "signal": signal, "path": None,
+                              "nbytes": _memory_bytes(signal)})
+        self.position = len(self._entries) - 1
+        self._enforce_budget()
+        return self.position
+
+    def get(self, index: int) -> Signal:
+        """Stage index (negative indices count from the newest stage)."""
+        entry = self._entries[index]
+        if entry["signal"] is None:
+            entry["signal"] = load_binary_signal(entry["path"], name=entry["name"])
+        return entry["signal"]
+
+    def current(self) -> Optional[Signal]:
+        return self.get(self.position) if self._entries else None
+
+    def can_undo(self) -> bool:
+        return self.position > 0
+
+    def can_redo(self) -> bool:
+        return self.position < len(self._entries) - 1
+
+    def undo(self) -> Signal:
+        if not self.can_undo():
+            raise ValueError("Nothing to undo.")
+        self.position -= 1
+        return self.get(self.position)
+
+    def redo(self) -> Signal:
+        if not self.can_redo():
+            raise ValueError("Nothing to redo.")
+        self.position += 1
+        return self.get(self.position)
+
+    def goto(self, index: int) -> Signal:
+        """Make stage index the current one (later stages stay available for redo)."""
+        if not 0 <= index < len(self._entries):
+            raise ValueError(f"No history stage {index}.")
+        self.position = index
+        return self.get(index)
+
+    def compare(self, i: int, j: int) -> tuple:
+        """The signals of stages i and j."""
+        return self.get(i), self.get(j)
+
+    def _enforce_budget(self):
+        """Spill the oldest in-memory stages (never the current one) until the budget is met."""
+        used = self.memory_bytes()
+        for index, entry in enumerate(self._entries):
+            if used <= self.budget_bytes:
+                break
+            if entry["path"] is not None or index == self.position:
+                continue
+            self._spill(entry)
+            used -= entry["nbytes"]
+
+    def _spill(self, entry: dict):
+        signal = entry["signal"]
+        path = os.path.join(self.spill_dir, f"stage{self._counter}{BINARY_EXTENSION}")
+        self._counter += 1
+        save_binary_signal(signal, path)
+        entry["path"], entry["name"], entry["signal"] = path, signal.name, None
+
+    def _discard(self, entry: dict):
+        entry["signal"] = None
+        if entry["path"] is not None:
+            try:
+                os.remove(entry["path"])
+            except OSError:  # still mapped (Windows), removed with the directory
+                pass
+
+    def clear(self):
+        for entry in self._entries:
+            self._discard(entry)
+        self._entries = []
+        self.position = -1
+
+    def close(self):
+        """Drop every stage and remove the spill directory if it was created here."""
+        self.clear()
+        if self._own_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
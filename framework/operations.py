@@ -14,110 +14,375 @@
 
     Normalization of signals
     
+    Add / subtract accept align="outer" | "inner" | "left" for signals whose
+    index ranges differ, missing samples are treated as zeros.
+
+    Accumulator and Normalizer do accumulation / normalization chunk by chunk
+    (e.g. on the chunks of fileHandling.read_signal_chunks), carrying their
+    state from one chunk to the next.
 
 """
-from signals import Signal
+from signals import Signal, UniformAxis, result_dtype
+from profiling import instrumented
 import numpy as np
+from typing import Iterable
+
+NORMALIZE_MODES = ("-1_to_1", "0_to_1")
+
+ALIGN_MODES = ("outer", "inner", "left")
 
 # internal validation function 
 
+def _x_values(sig: Signal) -> np.ndarray:
+    """x as an array, an implicit axis is expanded without caching the array on the signal."""
+    x = sig.shared_x()
+    return x.to_array() if isinstance(x, UniformAxis) else x
+
+
+@instrumented
 def _validate_signals(sig1: Signal, sig2: Signal):
     """Ensure both signals are compatible for operations."""
     if sig1.size() != sig2.size():
         raise ValueError("Signals must have the same number of samples.")
-    if not np.allclose(sig1.x, sig2.x):
+    if sig1.axis is not None and sig2.axis is not None:
+        same_x = sig1.axis.matches(sig2.axis)  # O(1) for implicit axes
+    else:
+        same_x = sig1.shared_x() is sig2.shared_x() or np.allclose(_x_values(sig1), _x_values(sig2))
+    if not same_x:
         raise ValueError("Signals must have identical x (time/frequency) values.")
     if sig1.signal_type != sig2.signal_type:
         raise ValueError("Signals must be in the same domain (time/frequency).")
 
 
-def add_signals(*signals: Signal, name: str = "Added Signal") -> Signal:
-    """Add two or more signals sample-by-sample."""
+# ===== alignment =====
+
+# x values this close are the same sample (float noise of fractional steps, e.g. 3 * 0.1 != 0.3)
+_X_RTOL = 1e-9
+_X_ATOL = 1e-12
+
+
+def _uniform_merge(axes: list, how: str):
+    """
+    Merged axis of implicit axes sharing one step and grid, computed in O(1).
+    Starts are placed on the grid by rounding (start - origin) / step, so
+    float noise in fractional steps doesn't split the grid.
+    Returns None when the axes are not on a common grid.
+    """
+    origin, step = axes[0].start, axes[0].step
+    offsets = []
+    for a in axes:
+        k = (a.start - origin) / step
+        if not np.isclose(a.step, step, rtol=_X_RTOL, atol=0) or abs(k - round(k)) > 1e-6:
+            return None
+        offsets.append(int(round(k)))
+
+    if how == "left":
+        return axes[0]
+    spans = [(k, k + a.count - 1, a) for k, a in zip(offsets, axes) if a.count]
+    if how == "outer":
+        if not spans:
+            return UniformAxis(origin, step, 0)
+        lo, hi = min(s[0] for s in spans), max(s[1] for s in spans)
+    else:
+        if len(spans) < len(axes):
+            return UniformAxis(origin, step, 0)
+        lo, hi = max(s[0] for s in spans), min(s[1] for s in spans)
+    if hi < lo:
+        return UniformAxis(origin, step, 0)
+    start = next(a.start for k, _, a in spans if k == lo)  # the exact start of an input axis
+    return UniformAxis(start, step, hi - lo + 1)
+
+
+def _nearest(x: np.ndarray, values: np.ndarray) -> tuple:
+    """Index of the element of sorted x nearest to each of values, and whether it is the same x."""
+    if not len(x):
+        return np.zeros(len(values), dtype=np.intp), np.zeros(len(values), dtype=bool)
+    right = np.minimum(np.searchsorted(x, values), len(x) - 1)
+    left = np.maximum(right - 1, 0)
+    pos = np.where(np.abs(x[left] - values) < np.abs(x[right] - values), left, right)
+    return pos, np.isclose(x[pos], values, rtol=_X_RTOL, atol=_X_ATOL)
+
+
+@instrumented
+def _aligned_combine(signals: tuple, weights: tuple, how: str) -> tuple:
+    """
+    Weighted sum of signals over a merged index axis, one merge for all of them.
+    how = "outer" (union of the axes), "inner" (intersection) or "left" (axis of the
+    first signal); samples a signal doesn't have count as zero.
+    Returns (x, y) where x is a UniformAxis when every input axis is implicit and on
+    the same grid, otherwise a sorted array.
+    """
+    if how not in ALIGN_MODES:
+        raise ValueError(f"Invalid align mode '{how}'. Use one of {ALIGN_MODES}.")
+    for s in signals[1:]:
+        if s.signal_type != signals[0].signal_type:
+            raise ValueError("Signals must be in the same domain (time/frequency).")
+
+    axes = [s.axis for s in signals]
+    merged = _uniform_merge(axes, how) if all(a is not None for a in axes) else None
+
+    if merged is not None:
+        # every signal is a contiguous run of the merged grid: place it with slices
+        y = np.zeros(len(merged), dtype=result_dtype(*signals))
+        for s, w in zip(signals, weights):
+            offset = int(round((s.axis.start - merged.start) / merged.step))
+            lo, hi = max(offset, 0), min(offset + s.size(), len(merged))
+            if lo < hi:
+                part = s.y[lo - offset:hi - offset]
+                y[lo:hi] += part if w == 1 else w * part
+        return merged, y
+
+    xs = [_x_values(s) for s in signals]
+    for x in xs:
+        if np.any(np.diff(x) <= 0):
+            raise ValueError("Aligned operations need strictly increasing x values.")
+    if how == "left":
+        x = xs[0]
+    elif how == "outer":
+        x = np.sort(np.concatenate(xs))
+        x = x[np.append(True, ~np.isclose(x[1:], x[:-1], rtol=_X_RTOL, atol=_X_ATOL))]
+    else:
+        x = xs[0]
+        for other in xs[1:]:
+            x = x[_nearest(other, x)[1]]
+
+    y = np.zeros(len(x), dtype=result_dtype(*signals))
+    for s, xi, w in zip(signals, xs, weights):
+        pos, hit = _nearest(x, xi)
+        part = s.y[hit]
+        y[pos[hit]] += part if w == 1 else w * part
+    return x, y
+
+
+@instrumented
+def add_signals(*signals: Signal, name: str = "Added Signal", align: str = None) -> Signal:
+    """
+    Add two or more signals sample-by-sample.
+    With align set, the signals may have different index ranges (see _aligned_combine).
+    """
     if len(signals) < 2:
         raise ValueError("At least two signals are required for addition.")
 
+    if align is not None:
+        x, y_sum = _aligned_combine(signals, (1,) * len(signals), align)
+        return Signal(
+            name=name,
+            signal_type=signals[0].signal_type,
+            is_periodic=any(s.is_periodic for s in signals),
+            x=x,
+            y=y_sum
+        )
+
     ref = signals[0] # reference for Validating the rest of the tuple
     for s in signals[1:]:
         _validate_signals(ref, s)
 
-    y_sum = np.sum([s.y for s in signals], axis=0)
+    # accumulate in place instead of stacking every signal into a temporary 2-D array
+    y_sum = np.array(ref.y, dtype=result_dtype(*signals))
+    for s in signals[1:]:
+        y_sum += s.y
 
     return Signal(
         name=name,
         signal_type=ref.signal_type,
         is_periodic=any(s.is_periodic for s in signals),
-        x=ref.x,
+        x=ref.shared_x(),
         y=y_sum
     )
 
-def subtract_signals(sig1: Signal, sig2: Signal, name: str = "Subtracted Signal") -> Signal:
-    """Subtract sig2 from sig1."""
+@instrumented
+def subtract_signals(sig1: Signal, sig2: Signal, name: str = "Subtracted Signal",
+                     align: str = None) -> Signal:
+    """Subtract sig2 from sig1, align works as in add_signals."""
+    if align is not None:
+        x, y_new = _aligned_combine((sig1, sig2), (1, -1), align)
+        return Signal(
+            name=name,
+            signal_type=sig1.signal_type,
+            is_periodic=sig1.is_periodic or sig2.is_periodic,
+            x=x,
+            y=y_new
+        )
+
     _validate_signals(sig1, sig2)
     y_new = sig1.y - sig2.y
     return Signal(
         name=name,
         signal_type=sig1.signal_type,
         is_periodic=sig1.is_periodic or sig2.is_periodic,
-        x=sig1.x,
+        x=sig1.shared_x(),
         y=y_new
     )
 
 
+@instrumented
 def multiply_signal_byConst(sig : Signal, const : float = 1.0, name :str = "Multiplied Signal") -> Signal:
     """Multiply signal amplitude by a constant."""
     return Signal(
         name=name,
         signal_type=sig.signal_type,
         is_periodic=sig.is_periodic,
-        x=sig.x,
+        x=sig.shared_x(),
         y=sig.y * const
         )
 
 
+@instrumented
 def normalize_signal(sig: Signal, mode: str = "-1_to_1") -> Signal:
     """
     Normalize signal amplitudes:
     mode = "-1_to_1" → scale between -1 and 1
     mode = "0_to_1"  → scale between 0 and 1
     """
+    _check_mode(mode)
     y = sig.y
     y_min, y_max = np.min(y), np.max(y)
     if y_max == y_min:
         raise ValueError("Cannot normalize a constant signal.")
 
-    if mode == "-1_to_1":
-        y_new = 2 * (y - y_min) / (y_max - y_min) - 1
-    elif mode == "0_to_1":
-        y_new = (y - y_min) / (y_max - y_min)
-    else:
-        raise ValueError("Invalid mode. Use '-1_to_1' or '0_to_1'.")
+    y_new = _normalize_values(y, y_min, y_max, mode)
 
     return Signal(
         name=sig.name + "Normalized",
         signal_type=sig.signal_type,
         is_periodic=sig.is_periodic,
-        x=sig.x,
+        x=sig.shared_x(),
         y=y_new
     )
 
 
+def _check_mode(mode: str):
+    if mode not in NORMALIZE_MODES:
+        raise ValueError("Invalid mode. Use '-1_to_1' or '0_to_1'.")
+
+
+def _normalize_values(y: np.ndarray, y_min: float, y_max: float, mode: str) -> np.ndarray:
+    if mode == "-1_to_1":
+        return 2 * (y - y_min) / (y_max - y_min) - 1
+    return (y - y_min) / (y_max - y_min)
+
+
+@instrumented
 def square_signal(sig: Signal, name: str = "Squared Signal") -> Signal:
     """Return a signal whose y values are squared."""
     return Signal(
         name=name,
         signal_type=sig.signal_type,
         is_periodic=sig.is_periodic,
-        x=sig.x,
+        x=sig.shared_x(),
         y=np.square(sig.y)
     )
 
 
+@instrumented
 def accumulate_signal(sig: Signal, name: str = "Acc Signal") -> Signal:
-    """Return cumulative sum of signal samples."""
+    """
+    Return cumulative sum of signal samples.
+    The running sum is kept in float64 (a float32 signal would lose precision
+    quickly) and stored in the signal's dtype.
+    """
     return Signal(
         name=name,
         signal_type=sig.signal_type,
         is_periodic=sig.is_periodic,
-        x=sig.x,
-        y=np.cumsum(sig.y)
-    )
\ No newline at end of file
+        x=sig.shared_x(),
+        y=np.cumsum(sig.y, dtype=np.float64).astype(sig.y.dtype, copy=False)
+    )
+
+
+# ===== chunked accumulation / normalization =====
+
+def _chunk_signal(chunk: Signal, y: np.ndarray, name: str) -> Signal:
+    return Signal(
+        name=name,
+        signal_type=chunk.signal_type,
+        is_periodic=chunk.is_periodic,
+        x=chunk.shared_x(),
+        y=y
+    )
+
+
+class Accumulator:
+    """
+    Running sum over consecutive chunks, the running total is carried from one
+    chunk to the next. The concatenated outputs equal accumulate_signal on the
+    whole signal bit for bit (the carry is folded into the first sample, so the
+    additions happen in the same order as one np.cumsum). Like accumulate_signal,
+    the running sum and the carry are float64.
+    """
+
+    def __init__(self, name: str = "Acc Signal"):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.carry = 0.0
+
+    @instrumented
+    def process(self, chunk: Signal) -> Signal:
+        y = np.array(chunk.y, dtype=np.float64)
+        if len(y):
+            y[0] += self.carry
+            np.cumsum(y, out=y)
+            self.carry = y[-1]
+        return _chunk_signal(chunk, y.astype(chunk.y.dtype, copy=False), self.name)
+
+
+class RunningBounds:
+    """Min / max of every sample passed to update() so far."""
+
+    def __init__(self):
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, y: np.ndarray):
+        if len(y):
+            self.min = min(self.min, np.min(y))
+            self.max = max(self.max, np.max(y))
+
+
+def scan_bounds(chunks: Iterable) -> tuple:
+    """(min, max) of the samples of an iterable of Signal chunks, the first pass of a two-pass normalize."""
+    bounds = RunningBounds()
+    for chunk in chunks:
+        bounds.update(chunk.y)
+    return bounds.min, bounds.max
+
+
+class Normalizer:
+    """
+    Chunked normalize_signal.
+
+    Two-pass (bounds given, e.g. from scan_bounds): every chunk is scaled with the
+    global min / max, so the concatenated outputs equal normalize_signal.
+
+    Online (bounds=None): each chunk is scaled with the running min / max of the
+    samples seen so far, including the chunk itself. Earlier chunks are not
+    revisited, so once the bounds grow the output only approximates the global
+    normalization. While every sample seen so far is equal the output is the
+    middle of the target range.
+    """
+
+    def __init__(self, mode: str = "-1_to_1", bounds: tuple = None, name: str = None):
+        _check_mode(mode)
+        self.mode = mode
+        self.name = name
+        self.online = bounds is None
+        self.bounds = RunningBounds()
+        if bounds is not None:
+            self.bounds.min, self.bounds.max = bounds
+            if self.bounds.max == self.bounds.min:
+                raise ValueError("Cannot normalize a constant signal.")
+
+    @instrumented
+    def process(self, chunk: Signal) -> Signal:
+        y = chunk.y
+        if self.online:
+            self.bounds.update(y)
+        y_min, y_max = self.bounds.min, self.bounds.max
+        if y_max == y_min or not len(y):
+            y_new = np.full(len(y), 0.0 if self.mode == "-1_to_1" else 0.5, dtype=y.dtype)
+        else:
+            y_new = _normalize_values(y, y_min, y_max, self.mode)
+        name = self.name if self.name is not None else chunk.name + "Normalized"
+        return _chunk_signal(chunk, y_new, name)
@@ -0,0 +1,138 @@
+"""
+    Parse cache :
+
+    An opt-in on-disk cache of parsed text signal files. The first load of a
+    file parses the text as usual and stores the result in the binary (.dsig)
+    container; later loads of the unchanged file memory map that copy instead
+    of parsing again.
+
+        cache = ParseCache()                      # ~/.cache/dsp-framework (or $DSP_CACHE_DIR)
+        sig = load_signal("Inputs/Signal1.txt", cache=cache)
+
+    Entries are keyed by the absolute path, size and modification time of the
+    source file (plus a hash of its content with use_hash=True, for file systems
+    with coarse timestamps). The total size of the cache directory is bounded:
+    the least recently used entries are removed first.
+
+    Several processes can share one cache directory: entries are written to a
+    temporary file and renamed into place, so a reader sees either no entry or
+    a complete one, and an entry that can't be read is treated as a miss.
+"""
+import hashlib
+import os
+import tempfile
+from signals import Signal
+from binaryFormat import BINARY_EXTENSION, load_binary_signal, save_binary_signal
+from typing import Optional
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_HASH_BLOCK = 1 << 20
+
+
+def default_cache_dir() -> str:
+    """$DSP_CACHE_DIR, otherwise dsp-framework in the user's cache directory."""
+    env = os.environ.get("DSP_CACHE_DIR")
+    if env:
+        return env
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "dsp-framework")
+
+
+def _content_hash(file_path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    Size bounded LRU cache of parsed signals in directory.
+    get() returns the cached Signal of a file (or None), put() stores one.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 use_hash: bool = False):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.use_hash = use_hash
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _key(self, file_path: str) -> tuple:
+        """(prefix, entry path): the prefix identifies the source path, the rest its version."""
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        prefix = hashlib.blake2b(path.encode("utf-8"), digest_size=10).hexdigest()
+        version = f"{st.st_size}-{st.st_mtime_ns}"
+        if self.use_hash:
+            version += "-" + _content_hash(path)
+        version = hashlib.blake2b(version.encode("utf-8"), digest_size=10).hexdigest()
+        return prefix, os.path.join(self.directory, f"{prefix}-{version}{BINARY_EXTENSION}")
+
+    def _entries(self) -> list:
+        """(path, size, last use) of every entry, oldest use first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(BINARY_EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:  # removed by another process meanwhile
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return sorted(entries, key=lambda e: e[2])
+
+    def get(self, file_path: str) -> Optional[Signal]:
+        """The cached signal of file_path, None if the file isn't cached in its current version."""
+        _, entry = self._key(file_path)
+        try:
+            signal = load_binary_signal(entry, name=os.path.basename(file_path))
+            os.utime(entry)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        return signal
+
+    def put(self, file_path: str, signal: Signal):
+        """Store the parsed signal of file_path, replacing older versions of the same file."""
+        prefix, entry = self._key(file_path)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            save_binary_signal(signal, tmp)
+            os.replace(tmp, entry)
+        except BaseException:
+            self._remove(tmp)
+            raise
+        for path, _, _ in self._entries():
+            if os.path.basename(path).startswith(prefix + "-") and path != entry:
+                self._remove(path)
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def size(self) -> int:
+        """Bytes used by the cache entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        # another process may have removed it already, or still map it (Windows)
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,156 @@
+"""
+    Level of detail plotting :
+
+    Draws signals of any length with a bounded number of points. A min/max
+    pyramid is built once per signal (level 1 holds the min and max of every
+    64 samples, each further level summarizes 4 buckets of the previous one),
+    so any view is served from the finest level that still gives about one
+    bucket per pixel column, in time proportional to the screen width.
+
+    LODPlot keeps a matplotlib line in sync with the axes: every zoom / pan
+    re-decimates the visible range. Decimated views are drawn as a min/max
+    envelope, only views with few visible samples show the raw samples
+    (as stems in discrete mode).
+"""
+from signals import Signal, UniformAxis
+import numpy as np
+from matplotlib.collections import LineCollection
+
+STEM_LIMIT = 1000   # largest number of visible samples drawn as stems
+_BASE = 64          # samples per bucket of the first summary level
+_FACTOR = 4         # buckets merged per further level
+_TOP = 2048         # levels are added until one has at most this many buckets
+
+
+def _reduce(values: np.ndarray, factor: int, func) -> np.ndarray:
+    """func (np.min / np.max) over consecutive groups of factor values, the last group may be short."""
+    full = len(values) // factor * factor
+    out = func(values[:full].reshape(-1, factor), axis=1)
+    if full < len(values):
+        out = np.append(out, func(values[full:]))
+    return out
+
+
+class MinMaxPyramid:
+    """Multi-level min/max summary of the samples of a signal."""
+
+    def __init__(self, signal: Signal):
+        self.y = np.asarray(signal.y, dtype=float)
+        self.n = len(self.y)
+        x = signal.shared_x()
+        self.axis = x if isinstance(x, UniformAxis) else None
+        self.x = None if self.axis is not None else np.asarray(x, dtype=float)
+
+        self.levels = []    # (bucket size, mins, maxs), finest first
+        mins = maxs = self.y
+        bucket, factor = 1, _BASE
+        while len(mins) > _TOP:
+            mins, maxs = _reduce(mins, factor, np.min), _reduce(maxs, factor, np.max)
+            bucket *= factor
+            factor = _FACTOR
+            self.levels.append((bucket, mins, maxs))
+
+    def x_at(self, index: np.ndarray) -> np.ndarray:
+        """x values of sample indices."""
+        if self.axis is not None:
+            return self.axis.start + self.axis.step * np.asarray(index, dtype=float)
+        return self.x[index]
+
+    def index_range(self, x0: float, x1: float) -> tuple:
+        """[i0, i1) sample indices whose x lies in [x0, x1], with one extra sample on each side."""
+        if self.n == 0:
+            return 0, 0
+        if self.axis is not None:
+            lo, hi = sorted(((x0 - self.axis.start) / self.axis.step,
+                             (x1 - self.axis.start) / self.axis.step))
+            i0, i1 = int(np.floor(lo)), int(np.ceil(hi)) + 1
+        else:
+            i0 = int(np.searchsorted(self.x, x0, side="left"))
+            i1 = int(np.searchsorted(self.x, x1, side="right"))
+        return max(i0 - 1, 0), min(i1 + 1, self.n)
+
+    def bounds(self) -> tuple:
+        """(y_min, y_max) of the whole signal."""
+        if self.n == 0:
+            return 0.0, 0.0
+        _, mins, maxs = self.levels[-1] if self.levels else (1, self.y, self.y)
+        return float(np.min(mins)), float(np.max(maxs))
+
+    def view(self, i0: int, i1: int, max_points: int) -> tuple:
+        """
+        Samples [i0, i1) reduced to at most max_points buckets.
+        Returns (index, y_min, y_max): the first sample index of every bucket and
+        the extremes in it. When no reduction is needed y_min and y_max are the samples.
+        """
+        n_visible = i1 - i0
+        max_points = max(int(max_points), 1)
+        if n_visible <= max_points:
+            y = self.y[i0:i1]
+            return np.arange(i0, i1), y, y
+
+        bucket, mins, maxs = 1, self.y, self.y
+        for level in self.levels:
+            if level[0] > n_visible / max_points:
+                break
+            bucket, mins, maxs = level
+        b0, b1 = i0 // bucket, -(-i1 // bucket)
+        group = -(-(b1 - b0) // max_points)
+        lo = _reduce(mins[b0:b1], group, np.min)
+        hi = _reduce(maxs[b0:b1], group, np.max)
+        index = (b0 + np.arange(len(lo)) * group) * bucket
+        return index, lo, hi
+
+
+class LODPlot:
+    """
+    A signal drawn on a matplotlib Axes through a MinMaxPyramid. The visible
+    range is re-decimated whenever the x limits change (zoom, pan, home).
+    """
+
+    def __init__(self, ax, signal: Signal, discrete: bool = False, label: str = None,
+                 color: str = None, linestyle: str = "-"):
+        self.ax = ax
+        self.pyramid = MinMaxPyramid(signal)
+        self.discrete = discrete
+        self.linestyle = linestyle
+        self.line, = ax.plot([], [], color=color, label=label, linestyle=linestyle)
+        self.stems = LineCollection([], colors=[self.line.get_color()], linestyles=linestyle)
+        ax.add_collection(self.stems)
+        self._cid = ax.callbacks.connect("xlim_changed", lambda _ax: self.update())
+
+    def x_range(self) -> tuple:
+        p = self.pyramid
+        if p.n == 0:
+            return 0.0, 1.0
+        return float(p.x_at(0)), float(p.x_at(p.n - 1))
+
+    def update(self):
+        """Redraw the samples inside the current x limits at screen resolution."""
+        p = self.pyramid
+        i0, i1 = p.index_range(*self.ax.get_xlim())
+        width = max(int(self.ax.bbox.width), 100)
+        if self.discrete and i1 - i0 <= STEM_LIMIT:
+            index, y, _ = p.view(i0, i1, STEM_LIMIT)
+            x = p.x_at(index)
+            self.line.set_data(x, y)
+            self.line.set_linestyle("None")
+            self.line.set_marker("o")
+            self.stems.set_segments(np.stack((np.column_stack((x, np.zeros_like(y))),
+                                              np.column_stack((x, y))), axis=1))
+        else:
+            index, lo, hi = p.view(i0, i1, width)
+            x = p.x_at(index)
+            if lo is hi:
+                self.line.set_data(x, lo)
+            else:
+                # vertical min -> max stroke per bucket, joined into one polyline
+                self.line.set_data(np.repeat(x, 2), np.column_stack((lo, hi)).ravel())
+            self.line.set_linestyle(self.linestyle)
+            self.line.set_marker("None")
+            self.stems.set_segments([])
+        self.ax.figure.canvas.draw_idle()
+
+    def remove(self):
+        self.ax.callbacks.disconnect(self._cid)
+        self.line.remove()
+        self.stems.remove()
@@ -0,0 +1,211 @@
+"""
+    Profiling :
+
+    Opt-in instrumentation of the hot paths (parsing, validation, the math,
+    writing). Functions decorated with @instrumented record, while profiling
+    is enabled, per call:
+        wall time, samples processed, bytes of the output arrays,
+        net bytes allocated (with track_memory, through tracemalloc)
+    aggregated per function into counters and a histogram of call durations
+    (power of two microsecond buckets).
+
+        import profiling
+        with profiling.profile("run.json"):      # or enable() ... export_json(path)
+            run_job()
+        print(profiling.report())
+
+    Setting DSP_PROFILE=<path> in the environment enables profiling at import
+    and writes the JSON report to <path> when the process exits.
+    While disabled a decorated function costs one extra call and a flag check.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+
+_enabled = False
+_track_memory = False
+_stats = {}
+_lock = threading.Lock()
+
+
+class _Stats:
+    __slots__ = ("calls", "total_s", "min_s", "max_s", "samples", "bytes_out", "bytes_allocated",
+                 "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_s = 0.0
+        self.min_s = float("inf")
+        self.max_s = 0.0
+        self.samples = 0
+        self.bytes_out = 0
+        self.bytes_allocated = 0
+        self.histogram = {}  # k -> calls that took less than 2**k microseconds (and at least 2**(k-1))
+
+    def add(self, seconds: float, samples: int, bytes_out: int, bytes_allocated: int):
+        self.calls += 1
+        self.total_s += seconds
+        self.min_s = min(self.min_s, seconds)
+        self.max_s = max(self.max_s, seconds)
+        self.samples += samples
+        self.bytes_out += bytes_out
+        self.bytes_allocated += bytes_allocated
+        bucket = int(seconds * 1e6).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_s": self.total_s,
+            "mean_s": self.total_s / self.calls if self.calls else 0.0,
+            "min_s": self.min_s if self.calls else 0.0,
+            "max_s": self.max_s,
+            "samples": self.samples,
+            "samples_per_s": self.samples / self.total_s if self.total_s else 0.0,
+            "bytes_out": self.bytes_out,
+            "bytes_allocated": self.bytes_allocated if _track_memory else None,
+            "histogram_us": {f"<{2 ** k}": n for k, n in sorted(self.histogram.items())},
+        }
+
+
+def _measure_output(result) -> tuple:
+    """(samples, bytes) of a call's result: a Signal, a sample array or anything else."""
+    if hasattr(result, "shared_x"):  # a Signal (signals imports this module, no isinstance)
+        arrays = (result.y, result.phase, result.shared_x())
+        nbytes = sum(a.nbytes for a in arrays if getattr(a, "nbytes", None) is not None)
+        return result.size(), nbytes
+    if hasattr(result, "nbytes") and getattr(result, "ndim", 0):
+        return len(result), result.nbytes
+    return 0, 0
+
+
+def _input_samples(args: tuple) -> int:
+    """Samples of the Signal arguments (also inside tuple / list arguments)."""
+    total = 0
+    for a in args:
+        for item in a if isinstance(a, (tuple, list)) else (a,):
+            if hasattr(item, "shared_x"):
+                total += item.size()
+    return total
+
+
+def record(name: str, seconds: float, samples: int = 0, bytes_out: int = 0, bytes_allocated: int = 0):
+    """Add one measurement of name (used by @instrumented and section, callable directly)."""
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = _Stats()
+        stats.add(seconds, samples, bytes_out, bytes_allocated)
+
+
+def instrumented(func=None, *, name: Optional[str] = None):
+    """
+    Decorator recording every call of func while profiling is enabled.
+    Samples are those of the returned Signal / array, or of the Signal
+    arguments when the result has none (e.g. a save or a validation).
+    """
+    if func is None:
+        return lambda f: instrumented(f, name=name)
+    key = name or f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        memory = _track_memory and tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if memory else 0
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0] - before if memory else 0
+        samples, bytes_out = _measure_output(result)
+        record(key, seconds, samples or _input_samples(args), bytes_out, max(allocated, 0))
+        return result
+
+    return wrapper
+
+
+@contextmanager
+def section(name: str, samples: int = 0):
+    """Time a block of code under name (when profiling is enabled)."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, samples)
+
+
+def enable(track_memory: bool = False):
+    """
+    Start recording. track_memory also measures the net bytes allocated per call
+    with tracemalloc (which slows every allocation down noticeably).
+    """
+    global _enabled, _track_memory
+    _track_memory = track_memory
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    if _track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def snapshot() -> dict:
+    """The aggregated measurements: {function name: counters + histogram}."""
+    with _lock:
+        return {name: stats.as_dict() for name, stats in sorted(_stats.items())}
+
+
+def export_json(file_path: str):
+    with open(file_path, 'w') as f:
+        json.dump(snapshot(), f, indent=2)
+
+
+def report() -> str:
+    """Human readable table of the measurements, slowest total time first."""
+    rows = sorted(snapshot().items(), key=lambda item: item[1]["total_s"], reverse=True)
+    lines = [f"{'function':48s} {'calls':>7s} {'total ms':>10s} {'mean ms':>9s} "
+             f"{'max ms':>9s} {'samples/s':>14s} {'MB out':>9s}"]
+    for name, s in rows:
+        lines.append(f"{name:48s} {s['calls']:7d} {s['total_s'] * 1e3:10.3f} {s['mean_s'] * 1e3:9.3f} "
+                     f"{s['max_s'] * 1e3:9.3f} {s['samples_per_s']:14,.0f} {s['bytes_out'] / 1e6:9.2f}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile(file_path: Optional[str] = None, track_memory: bool = False):
+    """Enable profiling for a block and write the JSON report to file_path (if given) at its end."""
+    enable(track_memory)
+    try:
+        yield
+    finally:
+        disable()
+        if file_path:
+            export_json(file_path)
+
+
+if os.environ.get("DSP_PROFILE"):
+    enable()
+    atexit.register(export_json, os.environ["DSP_PROFILE"])
@@ -0,0 +1,206 @@
+"""
+    Signal batch :
+
+    Many channels sharing one index axis (e.g. the sensors of an array),
+    stored in one contiguous (n_channels, n_samples) array. Every operation is
+    a single vectorized call over all channels instead of a loop over Signals:
+
+        batch = SignalBatch.from_signals([load_signal(p) for p in paths])
+        out = batch.subtract(reference).normalize("0_to_1")   # reference: one Signal, broadcast
+        total = out.sum()                                     # Signal, sum across channels
+        first = out.channel(0)                                # Signal viewing row 0, no copy
+
+    A Signal operand is broadcast against every channel; a per-channel array of
+    constants (length n_channels) is broadcast against the samples.
+"""
+from signals import Signal, UniformAxis, frozen_axis, as_samples, result_dtype
+from operations import _check_mode, _normalize_values
+import numpy as np
+from typing import Iterable, Optional, Union
+
+
+class SignalBatch:
+    """
+    Channels of equal length on one shared x axis.
+
+    Attributes:
+        data (np.ndarray): (n_channels, n_samples) float samples, row i is channel i.
+        x (UniformAxis or np.ndarray): shared x axis, in the stored form of Signal.shared_x().
+        names (list): channel names.
+        signal_type (int), sample_rate (Optional[float]): common to all channels.
+        is_periodic (np.ndarray): per-channel flags.
+    """
+
+    def __init__(self, data, x: Union[Iterable, UniformAxis, None] = None, names: Optional[list] = None,
+                 signal_type: int = 0, sample_rate: Optional[float] = None, is_periodic=False,
+                 dtype=None):
+        self.data = as_samples(data, dtype)
+        if self.data.ndim != 2:
+            raise ValueError("SignalBatch data must be a 2-D (channels, samples) array.")
+        n_channels, n_samples = self.data.shape
+        if x is None:
+            x = UniformAxis(0, 1, n_samples)
+        self.x = x if isinstance(x, UniformAxis) else frozen_axis(x)
+        if len(self.x) != n_samples:
+            raise ValueError(f"x has {len(self.x)} values, expected {n_samples}.")
+        self.names = list(names) if names is not None else [f"Channel {i}" for i in range(n_channels)]
+        if len(self.names) != n_channels:
+            raise ValueError(f"{len(self.names)} names given for {n_channels} channels.")
+        self.signal_type = signal_type
+        self.sample_rate = sample_rate
+        self.is_periodic = np.broadcast_to(np.asarray(is_periodic, dtype=bool), (n_channels,)).copy()
+
+    @classmethod
+    def from_signals(cls, signals: Iterable) -> "SignalBatch":
+        """Stack signals sharing one x axis (copied once into the batch array)."""
+        signals = list(signals)
+        if not signals:
+            raise ValueError("At least one signal is required.")
+        ref = signals[0]
+        data = np.empty((len(signals), ref.size()), dtype=result_dtype(*signals))
+        for i, sig in enumerate(signals):
+            if sig.size() != ref.size():
+                raise ValueError("Signals must have the same number of samples.")
+            if i:
+                _check_axes(ref.shared_x(), sig.shared_x(), ref.signal_type, sig.signal_type)
+            data[i] = sig.y
+        return cls(data, ref.shared_x(), [s.name for s in signals], ref.signal_type,
+                   ref.sample_rate, [s.is_periodic for s in signals])
+
+    # ===== channels =====
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    @property
+    def n_samples(self) -> int:
+        return self.data.shape[1]
+
+    def channel(self, i: int) -> Signal:
+        """Channel i as a Signal whose y is a view of row i (writes go to the batch)."""
+        return Signal(
+            name=self.names[i],
+            signal_type=self.signal_type,
+            is_periodic=bool(self.is_periodic[i]),
+            sample_rate=self.sample_rate,
+            x=self.x,
+            y=self.data[i]
+        )
+
+    def __iter__(self):
+        return (self.channel(i) for i in range(len(self)))
+
+    def __getitem__(self, key) -> Union[Signal, "SignalBatch"]:
+        """An int gives one channel as a Signal, a slice / index array a SignalBatch of those channels."""
+        if isinstance(key, (int, np.integer)):
+            return self.channel(key)
+        rows = np.arange(len(self))[key]
+        return self._derive(self.data[key], names=[self.names[i] for i in rows],
+                            is_periodic=self.is_periodic[key])
+
+    def to_signals(self) -> list:
+        return list(self)
+
+    def _derive(self, data: np.ndarray, names=None, is_periodic=None) -> "SignalBatch":
+        return SignalBatch(data, self.x, self.names if names is None else names,
+                           self.signal_type, self.sample_rate,
+                           self.is_periodic if is_periodic is None else is_periodic)
+
+    # ===== operations =====
+
+    def _operand(self, other) -> tuple:
+        """Samples of other shaped to broadcast against data, and its periodic flags."""
+        if isinstance(other, SignalBatch):
+            if other.data.shape != self.data.shape:
+                raise ValueError("Batches must have the same number of channels and samples.")
+            _check_axes(self.x, other.x, self.signal_type, other.signal_type)
+            return other.data, other.is_periodic
+        if isinstance(other, Signal):
+            if other.size() != self.n_samples:
+                raise ValueError("Signals must have the same number of samples.")
+            _check_axes(self.x, other.shared_x(), self.signal_type, other.signal_type)
+            return other.y, other.is_periodic
+        raise TypeError(f"Can't combine a SignalBatch with {type(other).__name__}.")
+
+    def add(self, other: Union["SignalBatch", Signal]) -> "SignalBatch":
+        """Channel-wise sum with another batch, or with one Signal added to every channel."""
+        values, periodic = self._operand(other)
+        return self._derive(self.data + values, is_periodic=self.is_periodic | periodic)
+
+    def subtract(self, other: Union["SignalBatch", Signal]) -> "SignalBatch":
+        values, periodic = self._operand(other)
+        return self._derive(self.data - values, is_periodic=self.is_periodic | periodic)
+
+    def multiply(self, const) -> "SignalBatch":
+        """Multiply by a constant, or by one constant per channel (length n_channels)."""
+        const = np.asarray(const, dtype=self.data.dtype)  # constants don't widen the samples
+        if const.ndim == 1:
+            if len(const) != len(self):
+                raise ValueError(f"Expected {len(self)} constants, one per channel.")
+            const = const[:, None]
+        return self._derive(self.data * const)
+
+    def square(self) -> "SignalBatch":
+        return self._derive(np.square(self.data))
+
+    def accumulate(self) -> "SignalBatch":
+        """Cumulative sum of every channel (float64 running sums, like accumulate_signal)."""
+        return self._derive(np.cumsum(self.data, axis=1, dtype=np.float64).astype(self.data.dtype, copy=False))
+
+    def normalize(self, mode: str = "-1_to_1") -> "SignalBatch":
+        """Normalize every channel with its own min / max (see operations.normalize_signal)."""
+        _check_mode(mode)
+        y_min = np.min(self.data, axis=1, keepdims=True)
+        y_max = np.max(self.data, axis=1, keepdims=True)
+        constant = np.flatnonzero(y_max == y_min)
+        if len(constant):
+            raise ValueError(f"Cannot normalize constant channel '{self.names[constant[0]]}'.")
+        return self._derive(_normalize_values(self.data, y_min, y_max, mode),
+                            names=[name + "Normalized" for name in self.names])
+
+    __add__ = __radd__ = add
+    __sub__ = subtract
+
+    def __mul__(self, const) -> "SignalBatch":
+        return self.multiply(const)
+
+    __rmul__ = __mul__
+
+    # ===== reductions across channels =====
+
+    def _reduced(self, y: np.ndarray, name: str) -> Signal:
+        return Signal(
+            name=name,
+            signal_type=self.signal_type,
+            is_periodic=bool(np.any(self.is_periodic)),
+            sample_rate=self.sample_rate,
+            x=self.x,
+            y=y
+        )
+
+    def sum(self, name: str = "Added Signal") -> Signal:
+        """Sample-wise sum of all channels (same result as add_signals on the channels)."""
+        return self._reduced(np.sum(self.data, axis=0), name)
+
+    def mean(self, name: str = "Mean Signal") -> Signal:
+        return self._reduced(np.mean(self.data, axis=0), name)
+
+    def min(self, name: str = "Min Signal") -> Signal:
+        return self._reduced(np.min(self.data, axis=0), name)
+
+    def max(self, name: str = "Max Signal") -> Signal:
+        return self._reduced(np.max(self.data, axis=0), name)
+
+    def std(self, name: str = "Std Signal") -> Signal:
+        return self._reduced(np.std(self.data, axis=0), name)
+
+
+def _check_axes(x1, x2, type1: int, type2: int):
+    if type1 != type2:
+        raise ValueError("Signals must be in the same domain (time/frequency).")
+    if isinstance(x1, UniformAxis) and isinstance(x2, UniformAxis):
+        same = x1.matches(x2)
+    else:
+        same = x1 is x2 or np.allclose(np.asarray(x1[:len(x1)]), np.asarray(x2[:len(x2)]))
+    if not same:
+        raise ValueError("Signals must have identical x (time/frequency) values.")
@@ -1,7 +1,160 @@
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import Optional ,Iterable
+from typing import Optional ,Iterable, Union
 import os
+from fractions import Fraction
+from profiling import instrumented
+
+
+# ===== Precision policy =====
+# Samples (y, phase) are float64 or float32, explicit x arrays float64, float32 or integer.
+#   - Signal(..., dtype=np.float32) stores one signal in float32.
+#   - set_default_dtype / set_index_dtype change the process-wide defaults, used for
+#     everything that has no precision of its own: lists, integers, parsed text files,
+#     generated signals.
+#   - float32 / float64 sample arrays keep their precision when adopted by a Signal.
+# Operations promote like numpy: float32 with float32 stays float32, anything combined
+# with float64 gives float64, and Python number constants don't widen a float32 signal.
+# Running sums (accumulate) are computed in float64 and stored in the signal's dtype.
+# Convolution and filters compute in float64.
+
+FLOAT_DTYPES = (np.dtype(np.float64), np.dtype(np.float32))
+INDEX_DTYPES = FLOAT_DTYPES + (np.dtype(np.int64), np.dtype(np.int32))
+
+_default_dtype = np.dtype(np.float64)
+_index_dtype = np.dtype(np.float64)
+
+
+def _checked_dtype(dtype, allowed: tuple) -> np.dtype:
+    dtype = np.dtype(dtype)
+    if dtype not in allowed:
+        raise ValueError(f"Unsupported dtype {dtype}. Use one of {[str(d) for d in allowed]}.")
+    return dtype
+
+
+def set_default_dtype(dtype) -> np.dtype:
+    """Set the process-wide sample dtype (float64 or float32), returns the previous one."""
+    global _default_dtype
+    previous, _default_dtype = _default_dtype, _checked_dtype(dtype, FLOAT_DTYPES)
+    return previous
+
+
+def get_default_dtype() -> np.dtype:
+    return _default_dtype
+
+
+def set_index_dtype(dtype) -> np.dtype:
+    """Set the process-wide dtype of explicit x arrays (float64, float32, int64, int32), returns the previous one."""
+    global _index_dtype
+    previous, _index_dtype = _index_dtype, _checked_dtype(dtype, INDEX_DTYPES)
+    return previous
+
+
+def get_index_dtype() -> np.dtype:
+    return _index_dtype
+
+
+def as_samples(values: Iterable, dtype=None) -> np.ndarray:
+    """
+    Sample array in dtype (without a copy when it already is one).
+    dtype=None keeps float32 / float64 arrays as they are and uses the default dtype otherwise.
+    """
+    if dtype is None:
+        if isinstance(values, np.ndarray) and values.dtype in FLOAT_DTYPES:
+            return values
+        dtype = _default_dtype
+    return np.asarray(values, dtype=_checked_dtype(dtype, FLOAT_DTYPES))
+
+
+def result_dtype(*signals) -> np.dtype:
+    """Sample dtype of an operation combining signals (numpy promotion, see the policy above)."""
+    return np.result_type(*(s.y.dtype for s in signals))
+
+
+def frozen_axis(values: Iterable, dtype=None) -> np.ndarray:
+    """
+    Read-only array for a sample axis.
+    Read-only arrays (e.g. the x of another Signal) are returned as they are,
+    so signals derived from one another share a single axis instead of copies.
+    Writable arrays owned by the caller are copied once so they can't change under the Signal.
+    dtype=None keeps float64 arrays and arrays already in the index dtype, anything
+    else is converted to the index dtype (see set_index_dtype).
+    """
+    if dtype is None:
+        dtype = _index_dtype
+        if isinstance(values, np.ndarray) and values.dtype == np.float64:
+            dtype = values.dtype
+    dtype = _checked_dtype(dtype, INDEX_DTYPES)
+    if dtype.kind == "i":
+        raw = np.asarray(values)
+        if raw.dtype.kind == "f" and np.any(raw != np.round(raw)):
+            raise ValueError("An integer index axis needs whole number x values.")
+    arr = np.asarray(values, dtype=dtype)
+    if arr.flags.writeable:
+        if arr is values or arr.base is not None:
+            arr = arr.copy()
+        arr.flags.writeable = False
+    return arr
+
+
+class UniformAxis:
+    """
+    Implicit evenly spaced sample axis: x[n] = start + n * step for n = 0 .. count-1.
+    Only (start, step, count) is stored, an array is built when someone asks for one.
+    """
+
+    __slots__ = ("start", "step", "count")
+
+    def __init__(self, start: float = 0.0, step: float = 1.0, count: int = 0):
+        self.start = float(start)
+        self.step = float(step)
+        self.count = int(count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, key):
+        """Values of the axis for an index or a slice, without building the whole array."""
+        if isinstance(key, slice):
+            return self.start + self.step * np.arange(*key.indices(self.count))
+        if key < 0:
+            key += self.count
+        if not 0 <= key < self.count:
+            raise IndexError("axis index out of range")
+        return self.start + self.step * key
+
+    def __repr__(self) -> str:
+        return f"UniformAxis(start={self.start}, step={self.step}, count={self.count})"
+
+    @property
+    def last(self) -> float:
+        return self.start + self.step * (self.count - 1)
+
+    def to_array(self) -> np.ndarray:
+        """The expanded (read-only) axis array."""
+        arr = self.start + self.step * np.arange(self.count)
+        arr.flags.writeable = False
+        return arr
+
+    def matches(self, other: "UniformAxis") -> bool:
+        """O(1) equivalent of np.allclose on the two expanded axes."""
+        if self.count != other.count:
+            return False
+        if self.count == 0:
+            return True
+        return bool(np.isclose(self.start, other.start) and np.isclose(self.last, other.last))
+
+
+def uniform_axis(x: np.ndarray) -> Optional[UniformAxis]:
+    """UniformAxis describing x if x is exactly start + step * arange(len(x)), else None."""
+    if isinstance(x, UniformAxis):
+        return x
+    if len(x) < 2:
+        return None
+    start, step = float(x[0]), float(x[1] - x[0])
+    if step == 0 or not np.array_equal(x, start + step * np.arange(len(x))):
+        return None
+    return UniformAxis(start, step, len(x))
 
 
 class Signal : 
@@ -13,40 +166,95 @@ class Signal :
         signal_type (int): 0 for time domain, 1 for frequency domain.
         is_periodic (bool): True if signal is periodic.
         sample_rate (Optional[float]): Sampling rate (Hz), if applicable.
-        x (np.array): Time samples or frequency bins.
+        x (np.array): Time samples or frequency bins (read-only, shared between derived signals).
         y (np.array): Amplitude values.
         phase (Optional[np.array]): Phase values (only for frequency domain).
+        axis (Optional[UniformAxis]): implicit form of x when it is evenly spaced.
+        period (Optional[int]): fundamental period in samples, when known (see detect_period).
+        time_axis (Optional[UniformAxis]): for a spectrum made by to_frequency, the x axis
+            of the time signal it came from (to_time restores it).
+
+    x goes through frozen_axis, y and phase float arrays are adopted without a copy,
+    so pass a copy if you keep modifying the array you built the Signal from.
+    x may also be given as a UniformAxis, the x array is then only built on first access.
+    dtype / index_dtype choose the precision of the samples / of an explicit x array
+    (see the precision policy above).
     """
 
+    __slots__ = ("name", "signal_type", "is_periodic", "sample_rate", "_x", "axis", "y", "phase",
+                 "period", "time_axis")
+
     # using any Iterable and converting it to np.array to avoid future Bugs
     def __init__(self,name: str = "",signal_type:int = 0,is_periodic: bool = False,
                  sample_rate : Optional[float] = None,
-                 x : Iterable = np.array([]),
-                 y : Iterable = np.array([]),
-                 phase : Optional[Iterable] = None):
+                 x : Union[Iterable, UniformAxis] = (),
+                 y : Iterable = (),
+                 phase : Optional[Iterable] = None,
+                 period : Optional[int] = None,
+                 dtype = None,
+                 index_dtype = None,
+                 time_axis : Optional[UniformAxis] = None):
 
         self.name = name
         self.signal_type = signal_type  # 0: time, 1: frequency , 2+ : phase or any future case
         self.is_periodic = is_periodic
         self.sample_rate = sample_rate
 
-        self.x = np.array(x, dtype=float)
-        self.y = np.array(y, dtype=float)
+        self._set_x(x, index_dtype)
+        self.y = as_samples(y, dtype)
 
-        self.phase = np.array(phase, dtype=float) if phase is not None else None        
+        self.phase = as_samples(phase, dtype) if phase is not None else None
+        self.period = period
+        self.time_axis = time_axis
 
+    @property
+    def x(self) -> np.ndarray:
+        if self._x is None:
+            self._x = self.axis.to_array()
+        return self._x
+
+    @x.setter
+    def x(self, values: Union[Iterable, UniformAxis]):
+        self._set_x(values)
+
+    def _set_x(self, values: Union[Iterable, UniformAxis], index_dtype=None):
+        """Store x, an explicit array goes through frozen_axis in index_dtype (default: the index dtype policy)."""
+        if isinstance(values, UniformAxis):
+            self.axis, self._x = values, None
+        else:
+            self.axis, self._x = None, frozen_axis(values, index_dtype)
+
+    def shared_x(self) -> Union[np.ndarray, UniformAxis]:
+        """x in its stored form, pass this to derived signals so an implicit axis stays implicit."""
+        return self.axis if self.axis is not None else self._x
 
     def size(self) -> int:
-        return len(self.x)          
+        return len(self.axis) if self.axis is not None else len(self._x)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Sample dtype of y."""
+        return self.y.dtype
+
+    def astype(self, dtype) -> "Signal":
+        """The signal with its samples in dtype, sharing x (self when nothing changes)."""
+        dtype = _checked_dtype(dtype, FLOAT_DTYPES)
+        if self.y.dtype == dtype and (self.phase is None or self.phase.dtype == dtype):
+            return self
+        return Signal(name=self.name, signal_type=self.signal_type, is_periodic=self.is_periodic,
+                      sample_rate=self.sample_rate, x=self.shared_x(), y=self.y, phase=self.phase,
+                      period=self.period, dtype=dtype, time_axis=self.time_axis)
 
     # for Debugging Mainly
     def __str__(self):
         domain = "Time Domain" if self.signal_type == 0 else "Frequency Domain"
         periodicity = "Periodic" if self.is_periodic else "Aperiodic"
-        size = len(self.x)
+        if self.period is not None:
+            periodicity += f" (period {self.period})"
+        size = self.size()
 
         preview_limit = 5
-        x_preview = np.array2string(self.x[:preview_limit], precision=3, separator=', ')
+        x_preview = np.array2string(np.asarray(self.shared_x()[:preview_limit]), precision=3, separator=', ')
         y_preview = np.array2string(self.y[:preview_limit], precision=3, separator=', ')
         phase_preview = (np.array2string(self.phase[:preview_limit], precision=3, separator=', ')
                         if self.phase is not None else "None")
@@ -60,6 +268,80 @@ class Signal :
             f"phase: {phase_preview}"
         )
     
+    # ===== Domain conversion =====
+    @instrumented
+    def to_frequency(self) -> "Signal":
+        """
+        DFT of a time domain signal via the real FFT, O(N log N).
+        Returns all N bins as a frequency domain Signal: x = bin frequencies
+        (k * Fs / N in Hz when sample_rate is known, else the bin index k),
+        y = amplitude |X[k]| and phase = angle(X[k]) in radians.
+        x must be evenly spaced; it is kept in time_axis so to_time gives the
+        samples back at their original positions (e.g. starting at n0 != 0).
+        """
+        if self.signal_type != 0:
+            raise ValueError("to_frequency needs a time domain signal.")
+        n = self.size()
+        time_axis = self._even_axis()
+
+        half = np.fft.rfft(self.y)
+        # bins above N/2 of a real signal are the conjugates of the ones below
+        spectrum = np.concatenate((half, np.conj(half[(n + 1) // 2 - 1:0:-1])))
+        step = self.sample_rate / n if self.sample_rate else 1.0
+        return Signal(
+            name=self.name + " (Frequency)",
+            signal_type=1,
+            is_periodic=self.is_periodic,
+            sample_rate=self.sample_rate,
+            x=UniformAxis(0, step, n),
+            y=np.abs(spectrum),
+            phase=np.angle(spectrum),
+            time_axis=time_axis
+        )
+
+    @instrumented
+    def to_time(self) -> "Signal":
+        """
+        Inverse DFT of a frequency domain signal (amplitude + phase), O(N log N).
+        A conjugate symmetric spectrum (the DFT of a real signal) goes through the
+        inverse real FFT, otherwise the real part of the complex inverse FFT is kept.
+        x is the time_axis recorded by to_frequency, else the indices 0 .. N-1.
+        """
+        if self.signal_type != 1:
+            raise ValueError("to_time needs a frequency domain signal.")
+        if self.phase is None:
+            raise ValueError("Frequency-domain signal must have a 'phase' attribute.")
+        n = self.size()
+
+        spectrum = self.y * np.exp(1j * self.phase)
+        half = spectrum[:n // 2 + 1]
+        tol = 1e-9 * (np.max(self.y) if n else 0.0)
+        if np.allclose(spectrum[n // 2 + 1:], np.conj(half[(n + 1) // 2 - 1:0:-1]), rtol=1e-9, atol=tol):
+            y = np.fft.irfft(half, n)
+        else:
+            y = np.fft.ifft(spectrum).real
+        return Signal(
+            name=self.name + " (Time)",
+            signal_type=0,
+            is_periodic=self.is_periodic,
+            sample_rate=self.sample_rate,
+            x=self.time_axis if self.time_axis is not None and len(self.time_axis) == n
+            else UniformAxis(0, 1, n),
+            y=y
+        )
+
+    def _even_axis(self) -> UniformAxis:
+        """x as a UniformAxis, raising when the samples are not evenly spaced."""
+        if self.axis is not None:
+            return self.axis
+        x, n = self._x, self.size()
+        if n < 2:
+            return UniformAxis(x[0] if n else 0.0, 1.0, n)
+        axis = UniformAxis(x[0], (x[-1] - x[0]) / (n - 1), n)
+        if axis.step == 0 or not np.allclose(x, axis.to_array()):
+            raise ValueError(f"'{self.name}' needs evenly spaced x values for a DFT.")
+        return axis
+
     # for Debugging 
     def plot(self):
         import matplotlib.pyplot as plt
@@ -71,26 +353,77 @@ class Signal :
         plt.grid(True)
         plt.show()
 
-# Not Sure of the Validity of this function and if there's a better way, 
-# Complexity -> O(N^2)
-# UPDATE: INVALID FUNCTION
-def validate_is_periodic(signal : Signal, eps=1e-6):
-    N = signal.size()
-    
-    for p in range(1, N//2 + 1):
-        flag = True
-        for i in range(N - p):
-            if abs(signal.y[i] - signal.y[i + p]) > eps:
-                flag = False
-                break
-        if flag:
-            return True
-    
-    return False
+@instrumented
+def detect_period(signal : Signal, tol: float = 1e-6, max_checks: int = 16) -> Optional[int]:
+    """
+    Fundamental period (in samples) of the signal, or None if it isn't periodic.
+    A period p (at most N/2, so at least two full cycles are seen) must satisfy
+    |y[i] - y[i + p]| <= tol for every i.
+
+    The squared difference energy D(p) = sum (y[i] - y[i+p])^2 of every lag is
+    computed at once from the FFT autocorrelation, O(N log N). Lags whose D(p)
+    is small enough to possibly be periods are then checked exactly in
+    increasing order (at most max_checks of them, O(N) each).
+    """
+    N = len(signal.y)
+    if N < 2:
+        return None
+    # float64 even for float32 samples: a complex64 FFT's round-off would hide real periods
+    y = np.asarray(signal.y, dtype=np.float64)
+    y = y - np.mean(y)  # D(p) ignores offsets, centering keeps the FFT accurate
+    max_p = N // 2
+
+    nfft = 1 << (2 * N - 1).bit_length()  # zero padding: linear, not circular, correlation
+    spectrum = np.fft.rfft(y, nfft)
+    corr = np.fft.irfft(spectrum * np.conj(spectrum), nfft)[1:max_p + 1]
+
+    energy = np.concatenate(([0.0], np.cumsum(y * y)))  # energy[k] = sum of y[:k]^2
+    lags = np.arange(1, max_p + 1)
+    diff = energy[N - lags] + (energy[N] - energy[lags]) - 2 * corr
+    # every |difference| <= tol bounds D(p) by (N - p) tol^2, plus room for FFT round-off
+    threshold = (N - lags) * tol ** 2 + 1e-10 * energy[N]
+
+    for p in lags[diff <= threshold][:max_checks]:
+        if np.max(np.abs(y[p:] - y[:-p])) <= tol:
+            return int(p)
+    return None
+
 
+def validate_is_periodic(signal : Signal, eps=1e-6) -> bool:
+    """True if the signal repeats with some period of at most N/2 samples (see detect_period)."""
+    return detect_period(signal, eps) is not None
 
-def generate_signal(file_path: str) -> Signal:
+
+def _sinusoid_period(F: float, Fs: float, n_samples: int) -> Optional[int]:
+    """
+    Period in samples of a sampled sinusoid: the smallest P with P * F / Fs an integer.
+    None if F / Fs isn't a (reasonable) rational number or P doesn't fit twice in the signal.
+    """
+    ratio = Fraction(F / Fs).limit_denominator(10 ** 6)
+    if abs(float(ratio) - F / Fs) > 1e-12:
+        return None
+    P = ratio.denominator
+    return P if P <= n_samples // 2 else None
+
+
+@instrumented
+def generate_signal(file_path: str, detect_periodicity: bool = False, dtype=None) -> Signal:
+    """
+    Generate the sin/cos described by a parameter file (see read_gen_file).
+    With detect_periodicity the period is derived from F / Fs (no scan of the samples)
+    and stored in period / is_periodic.
+    Files with "tone = ..." lines are tone banks, the sum of their tones is returned
+    (see generators.py); their period is found with detect_period.
+    The samples are computed in float64 and stored in dtype (default: get_default_dtype()).
+    """
     params = read_gen_file(file_path)
+    if any(key.lower() == "tone" for key in params):
+        from generators import generate_tone_bank
+        signal = generate_tone_bank(file_path, summed=True, dtype=dtype)
+        if detect_periodicity:
+            signal.period = detect_period(signal)
+            signal.is_periodic = signal.period is not None
+        return signal
     
     sig_type = params.get("type")
     A = params.get("A")
@@ -110,18 +443,23 @@ def generate_signal(file_path: str) -> Signal:
     else:
         raise ValueError(f"Unknown signal type '{sig_type}'")
 
-    nx = np.arange(0,len(y),1)
-    ret = Signal(name=name, signal_type=0, is_periodic=False, sample_rate=Fs, x=nx, y=y)
+    period = None
+    if detect_periodicity:
+        period = 1 if A == 0 else _sinusoid_period(F, Fs, len(y))
+
+    nx = UniformAxis(0, 1, len(y))
+    ret = Signal(name=name, signal_type=0, is_periodic=period is not None, sample_rate=Fs,
+                 x=nx, y=y, period=period, dtype=dtype if dtype is not None else _default_dtype)
     return ret
 
 
 def read_gen_file(file_path: str) -> dict:
     """Reads parameters from a .txt file for sine/cosine generation """
-    """One Signal at a Time with out double quotes """
+    """One Signal at a Time with out double quotes, # starts a comment """
     params = {}
     with open(file_path, 'r') as f:
         for line in f:
-            line = line.strip()
+            line = line.split('#', 1)[0].strip()
             if not line or '=' not in line:
                 continue
             key, value = line.split('=', 1)
@@ -0,0 +1,152 @@
+"""
+    Asynchronous file I/O checks :
+
+    asyncFiles.py loads and saves: results in submission order, errors
+    propagated or returned, the IOLimiter bounds, and the CPU heavy steps kept
+    off the event loop. Runnable directly or with pytest:
+
+        python tests/AsyncFilesTest.py
+        python -m pytest tests/AsyncFilesTest.py
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+import asyncFiles
+from asyncFiles import IOLimiter, async_load_signal, load_signals, save_signals
+from signals import Signal, UniformAxis
+from fileHandling import load_signal, save_signal
+from parseCache import ParseCache
+
+SIN = os.path.join(ROOT, "sin_cos", "SinOutput.txt")
+
+
+def _write_signals(directory: str, sizes) -> list:
+    paths = []
+    for i, n in enumerate(sizes):
+        path = os.path.join(directory, f"{i}.txt")
+        save_signal(Signal(x=UniformAxis(0, 1, n), y=np.full(n, float(i))), path, int_index=True)
+        paths.append(path)
+    return paths
+
+
+def test_results_keep_submission_order():
+    tmp = tempfile.mkdtemp()
+    try:
+        # big files first, so the small ones behind them finish earlier
+        paths = _write_signals(tmp, [200000, 50000, 10, 1, 3000, 7] * 3)
+        for concurrency in (1, 4, 18):
+            signals = load_signals(paths, concurrency=concurrency, budget_bytes=1 << 20)
+            assert [s.name for s in signals] == [os.path.basename(p) for p in paths], concurrency
+            assert all(np.all(s.y == i) for i, s in enumerate(signals))
+
+        out = [os.path.join(tmp, f"out{i}.dsig") for i in range(len(signals))]
+        assert save_signals(zip(signals, out), concurrency=4) == out
+        assert all(np.array_equal(load_signal(o).y, s.y) for o, s in zip(out, signals))
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_errors_propagate_or_are_returned():
+    tmp = tempfile.mkdtemp()
+    try:
+        paths = _write_signals(tmp, [10, 20, 30])
+        broken = os.path.join(tmp, "broken.txt")
+        with open(broken, 'w') as f:
+            f.write("0\n0\n2\n0 1\n1 x\n")
+        cases = ((1, os.path.join(tmp, "missing.txt"), FileNotFoundError), (2, broken, ValueError))
+        for position, bad, error in cases:
+            files = paths[:position] + [bad] + paths[position:]
+            try:
+                load_signals(files, concurrency=2)
+            except error:
+                pass
+            else:
+                raise AssertionError(f"{error.__name__} not raised")
+            results = load_signals(files, concurrency=2, return_exceptions=True)
+            assert isinstance(results.pop(position), error)
+            assert [r.name for r in results] == ["0.txt", "1.txt", "2.txt"]
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_limiter_bounds_and_order():
+    async def run():
+        limiter = IOLimiter(concurrency=2, budget_bytes=100)
+        admitted, peak = [], {"active": 0, "bytes": 0}
+
+        async def job(i, nbytes):
+            async with limiter.hold(nbytes):
+                admitted.append(i)
+                peak["active"] = max(peak["active"], limiter.active)
+                if limiter.active > 1:
+                    peak["bytes"] = max(peak["bytes"], limiter.in_flight)
+                await asyncio.sleep(0.001 * (5 - i % 5))
+
+        sizes = [60, 30, 50, 500, 10, 40, 40, 90]
+        await asyncio.gather(*(job(i, n) for i, n in enumerate(sizes)))
+        assert admitted == list(range(len(sizes)))
+        assert peak["active"] <= 2 and peak["bytes"] <= 100
+
+        # a job cancelled while it waits doesn't hold up the ones queued behind it
+        async with limiter.hold(100):
+            waiting = asyncio.ensure_future(job(0, 50))
+            behind = asyncio.ensure_future(job(1, 0))
+            await asyncio.sleep(0)
+            waiting.cancel()
+        await asyncio.wait_for(behind, 1)
+
+    asyncio.run(run())
+
+
+def test_conversions_run_off_the_event_loop():
+    tmp = tempfile.mkdtemp()
+    finish_load = asyncFiles._finish_load
+    threads = []
+
+    def recording(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return finish_load(*args, **kwargs)
+
+    async def run():
+        cache = ParseCache(os.path.join(tmp, "cache"))
+        binary = os.path.join(tmp, "sin.dsig")
+        save_signal(load_signal(SIN), binary)
+        for _ in range(2):  # a cache miss, then a hit
+            assert (await async_load_signal(SIN, cache=cache, dtype=np.float32)).y.dtype == np.float32
+        assert (await async_load_signal(binary, dtype=np.float32)).y.dtype == np.float32
+        assert (await async_load_signal(binary, detect_periodicity=True)).is_periodic
+        return threading.current_thread()
+
+    asyncFiles._finish_load = recording
+    try:
+        loop_thread = asyncio.run(run())
+    finally:
+        asyncFiles._finish_load = finish_load
+        shutil.rmtree(tmp)
+    assert len(threads) == 4 and loop_thread not in threads
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
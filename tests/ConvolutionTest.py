@@ -0,0 +1,106 @@
+"""
+    Convolution checks :
+
+    The direct, FFT and overlap-add methods of convolution.py must give the
+    same result, for whole signals and for a stream of chunks. Runnable
+    directly or with pytest:
+
+        python tests/ConvolutionTest.py
+        python -m pytest tests/ConvolutionTest.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+import convolution
+from signals import Signal, UniformAxis
+from convolution import (OverlapAddConvolver, choose_method, convolve_arrays, convolve_signals,
+                         correlate_signals)
+
+SIZES = ((1, 1), (5, 3), (3, 5), (1000, 7), (1000, 1000), (20000, 300), (300, 20000))
+
+
+def _arrays(n: int, m: int) -> tuple:
+    rng = np.random.default_rng(n * 7 + m)
+    return rng.standard_normal(n), rng.standard_normal(m)
+
+
+def test_methods_agree():
+    for n, m in SIZES:
+        a, b = _arrays(n, m)
+        expected = np.convolve(a, b)
+        for method in convolution.METHODS:
+            y = convolve_arrays(a, b, method)
+            assert len(y) == n + m - 1, (n, m, method)
+            assert np.allclose(y, expected, rtol=0, atol=1e-9), (n, m, method)
+
+
+def test_overlap_add_across_batches():
+    a, b = _arrays(50000, 200)
+    budget = convolution._OVERLAP_ADD_BUDGET
+    convolution._OVERLAP_ADD_BUDGET = 1  # one block per batched FFT
+    try:
+        y = convolve_arrays(a, b, "overlap_add")
+    finally:
+        convolution._OVERLAP_ADD_BUDGET = budget
+    assert np.allclose(y, np.convolve(a, b), rtol=0, atol=1e-9)
+
+
+def test_auto_method_choice():
+    assert choose_method(100000, 32) == "direct"
+    assert choose_method(100000, 1000) == "overlap_add"
+    assert choose_method(5000, 4000) == "fft"
+
+
+def test_signal_axes():
+    sig = Signal(x=UniformAxis(-3, 1, 10), y=np.arange(10.0))
+    kernel = Signal(x=UniformAxis(1, 1, 3), y=[1.0, 2.0, 3.0])
+    result = convolve_signals(sig, kernel)
+    assert isinstance(result.shared_x(), UniformAxis)
+    assert result.x[0] == -2 and result.size() == 12
+    assert np.allclose(result.y, np.convolve(sig.y, kernel.y))
+
+    corr = correlate_signals(sig, kernel)
+    assert np.allclose(corr.y, np.correlate(sig.y, kernel.y, "full"))
+    assert corr.x[0] == -3 - 3  # sig's first position minus kernel's last one
+    auto = correlate_signals(sig, normalize=True)
+    assert np.isclose(auto.y[np.flatnonzero(auto.x == 0)[0]], 1.0) and np.max(np.abs(auto.y)) <= 1 + 1e-12
+
+
+def test_chunked_convolver_matches_one_shot():
+    a, b = _arrays(10000, 300)
+    sig = Signal(x=UniformAxis(5, 1, len(a)), y=a)
+    kernel = Signal(x=UniformAxis(0, 1, len(b)), y=b)
+    whole = convolve_signals(sig, kernel, method="direct")
+    for method in convolution.METHODS:
+        # one-sample chunks only with np.convolve, 10000 tiny FFTs would just slow the suite down
+        for size in (1, 299, 1000, 4096) if method == "direct" else (299, 1000, 4096):
+            conv = OverlapAddConvolver(kernel, method)
+            parts = [conv.process(Signal(x=UniformAxis(5 + i, 1, len(a[i:i + size])), y=a[i:i + size]))
+                     for i in range(0, len(a), size)]
+            parts.append(conv.flush())
+            y = np.concatenate([p.y for p in parts])
+            x = np.concatenate([p.x for p in parts])
+            assert np.allclose(y, whole.y, rtol=0, atol=1e-9), (method, size)
+            assert np.allclose(x, whole.x), (method, size)
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
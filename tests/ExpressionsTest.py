@@ -0,0 +1,98 @@
+"""
+    Lazy expression checks :
+
+    A SignalExpr evaluated block by block (expressions.py) must give exactly
+    the result of the eager functions of operations.py, whatever the block
+    size. Runnable directly or with pytest:
+
+        python tests/ExpressionsTest.py
+        python -m pytest tests/ExpressionsTest.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from signals import Signal, UniformAxis
+from expressions import lazy
+from operations import (accumulate_signal, add_signals, multiply_signal_byConst, normalize_signal,
+                        square_signal, subtract_signals)
+
+BLOCK_SIZES = (1, 7, 1000, 65536)
+N_SAMPLES = 5000
+
+
+def _signals(dtype=np.float64) -> tuple:
+    rng = np.random.default_rng(0)
+    return tuple(Signal(name=f"s{i}", x=UniformAxis(0, 1, N_SAMPLES),
+                        y=rng.standard_normal(N_SAMPLES).astype(dtype)) for i in range(3))
+
+
+def _check(expr, expected: Signal):
+    for block_size in BLOCK_SIZES:
+        result = expr.evaluate(block_size)
+        assert result.y.dtype == expected.y.dtype, block_size
+        assert np.array_equal(result.y, expected.y), f"block size {block_size}"
+        assert result.shared_x() is expected.shared_x() and result.name == expected.name
+
+
+def test_chain_matches_eager():
+    a, b, c = _signals()
+    eager = normalize_signal(multiply_signal_byConst(square_signal(add_signals(a, b, c)), 5), "0_to_1")
+    _check(((lazy(a) + b + c).square() * 5).normalize("0_to_1"), eager)
+
+
+def test_subtract_and_accumulate_match_eager():
+    a, b, _ = _signals()
+    eager = normalize_signal(accumulate_signal(subtract_signals(a, b)))
+    _check((lazy(a) - b).accumulate().normalize(), eager)
+    _check((b - lazy(a)).accumulate(), accumulate_signal(subtract_signals(b, a)))
+
+
+def test_shared_sub_expression():
+    a, b, _ = _signals()
+    total = (lazy(a) + b).accumulate()
+    eager_total = accumulate_signal(add_signals(a, b))
+    # the running sum is advanced once per block, however many users it has
+    _check(total + total.square(), add_signals(eager_total, square_signal(eager_total)))
+
+
+def test_float32_promotion():
+    a, b, _ = _signals(np.float32)
+    _check((lazy(a) + b).accumulate() * 0.5,
+           multiply_signal_byConst(accumulate_signal(add_signals(a, b)), 0.5))
+    wide = Signal(x=a.shared_x(), y=b.y.astype(np.float64))
+    assert (lazy(a) + wide).evaluate().y.dtype == np.float64
+
+
+def test_leaf_and_errors():
+    a, _, _ = _signals()
+    assert lazy(a).evaluate() is a
+    for build in (lambda: lazy(a) + Signal(x=UniformAxis(0, 1, 3), y=[1.0, 2.0, 3.0]),
+                  lambda: lazy(a).normalize("0_to_2"),
+                  lambda: lazy(Signal(x=UniformAxis(0, 1, 3), y=np.ones(3))).normalize().evaluate()):
+        try:
+            build()
+        except ValueError:
+            continue
+        raise AssertionError("invalid expression accepted")
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
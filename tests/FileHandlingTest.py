@@ -0,0 +1,149 @@
+"""
+    File handling checks :
+
+    Regression checks of the text signal format (load_signal, the streaming
+    read_signal_chunks, the parse cache and save_signal), runnable directly
+    or with pytest:
+
+        python tests/FileHandlingTest.py
+        python -m pytest tests/FileHandlingTest.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from signals import Signal, UniformAxis, set_index_dtype
+from fileHandling import load_signal, read_signal_chunks, save_signal
+from parseCache import ParseCache
+
+
+def _write(text: str) -> str:
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    return path
+
+
+def _loaders(path: str):
+    """(name, callable returning (x, y)) for the whole file and the streamed loads."""
+    def streamed(chunk_size):
+        chunks = read_signal_chunks(path, chunk_size)
+        next(chunks)
+        chunks = list(chunks)
+        return np.concatenate([c.x for c in chunks]), np.concatenate([c.y for c in chunks])
+    yield "load_signal", lambda: (load_signal(path).x, load_signal(path).y)
+    yield "read_signal_chunks(1)", lambda: streamed(1)
+    yield "read_signal_chunks(65536)", lambda: streamed(65536)
+
+
+def _expect_error(text: str, message: str):
+    path = _write(text)
+    try:
+        for name, load in _loaders(path):
+            try:
+                load()
+            except ValueError as e:
+                assert message in str(e), f"{name}: unexpected error '{e}'"
+            else:
+                raise AssertionError(f"{name} accepted {text!r}")
+    finally:
+        os.remove(path)
+
+
+def test_trailing_text_is_ignored():
+    path = _write("0\n0\n2\n0 1\n1 2\nend of data\n")
+    try:
+        for name, load in _loaders(path):
+            x, y = load()
+            assert np.array_equal(x, [0, 1]) and np.array_equal(y, [1, 2]), name
+    finally:
+        os.remove(path)
+
+
+def test_blank_lines_and_crlf():
+    path = _write("0\r\n0\r\n2\r\n\r\n0\t1\r\n\r\n  1  2  \r\n")
+    try:
+        for name, load in _loaders(path):
+            x, y = load()
+            assert np.array_equal(x, [0, 1]) and np.array_equal(y, [1, 2]), name
+    finally:
+        os.remove(path)
+
+
+def test_row_with_extra_column_raises():
+    _expect_error("0\n0\n3\n0 1\n1 2 3\n2 4\n", "sample 1 has 3")
+
+
+def test_row_with_missing_column_raises():
+    _expect_error("0\n0\n3\n0 1\n1\n2 4\n", "sample 1 has 1")
+
+
+def test_non_numeric_sample_raises():
+    _expect_error("0\n0\n2\n0 1\n1 x\n", "non numeric")
+
+
+def test_missing_samples_raise():
+    _expect_error("0\n0\n3\n0 1\n1 2\n", "only 2 could be read")
+
+
+def test_cache_keeps_full_precision():
+    path = os.path.join(ROOT, "sin_cos", "SinOutput.txt")
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache = ParseCache(cache_dir)
+        assert load_signal(path, cache=cache, dtype=np.float32).y.dtype == np.float32
+        cached = load_signal(path, cache=cache)
+        assert cached.y.dtype == np.float64
+        assert np.array_equal(cached.y, load_signal(path).y)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_float32_text_is_shortest_and_exact():
+    y = np.random.default_rng(0).standard_normal(1000).astype(np.float32)
+    y[0] = 0.1
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        save_signal(Signal(name="a", x=UniformAxis(0, 1, len(y)), y=y, dtype=np.float32), path,
+                    int_index=True)
+        with open(path) as f:
+            assert f.read().splitlines()[3] == "0\t0.1"
+        assert np.array_equal(load_signal(path, dtype=np.float32).y, y)
+    finally:
+        os.remove(path)
+
+
+def test_integer_index_dtype_keeps_fractional_frequencies():
+    path = _write("1\n0\n3\n0 1 0\n0.5 2 0.25\n1.75 3 0.5\n")
+    previous = set_index_dtype(np.int64)
+    try:
+        for name, load in _loaders(path):
+            x, y = load()
+            assert np.array_equal(x, [0, 0.5, 1.75]) and np.array_equal(y, [1, 2, 3]), name
+    finally:
+        set_index_dtype(previous)
+        os.remove(path)
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+    Filter checks :
+
+    The stateful filters of filters.py must give the same output whether a
+    signal is filtered in one go or chunk by chunk (chunk sizes around the
+    biquad block length included). Runnable directly or with pytest:
+
+        python tests/FiltersTest.py
+        python -m pytest tests/FiltersTest.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from filters import BiquadFilter, biquad_design, fir_design, moving_average, _BlockFilter
+
+CHUNK_SIZES = (1, 7, 127, 128, 129, 1000, 4096)
+N_SAMPLES = 20000
+
+
+def _input() -> np.ndarray:
+    return np.random.default_rng(0).standard_normal(N_SAMPLES)
+
+
+def _chunked(filt, x: np.ndarray, size: int) -> np.ndarray:
+    filt.reset()
+    return np.concatenate([filt.process_block(x[i:i + size]) for i in range(0, len(x), size)])
+
+
+def _one_shot(filt, x: np.ndarray) -> np.ndarray:
+    filt.reset()
+    return filt.process_block(x)
+
+
+def _reference_biquads(sections, x: np.ndarray) -> np.ndarray:
+    """Per sample direct form I, the textbook difference equation."""
+    y = np.array(x, dtype=float)
+    for b0, b1, b2, a0, a1, a2 in sections:
+        out = np.zeros(len(y))
+        for n in range(len(y)):
+            acc = b0 * y[n]
+            if n >= 1:
+                acc += b1 * y[n - 1] - a1 * out[n - 1]
+            if n >= 2:
+                acc += b2 * y[n - 2] - a2 * out[n - 2]
+            out[n] = acc / a0
+        y = out
+    return y
+
+
+def test_block_filter_is_abstract():
+    try:
+        _BlockFilter()
+    except TypeError:
+        return
+    raise AssertionError("_BlockFilter could be instantiated")
+
+
+def test_fir_direct_chunked_is_bit_identical():
+    x = _input()
+    for filt in (fir_design("lowpass", 0.1, num_taps=101), moving_average(5)):
+        whole = _one_shot(filt, x)
+        assert np.allclose(whole, np.convolve(x, filt.taps)[:len(x)], rtol=0, atol=1e-12)
+        for size in CHUNK_SIZES:
+            assert np.array_equal(_chunked(filt, x, size), whole), f"chunk size {size}"
+
+
+def test_fir_fft_chunked_matches_one_shot():
+    x = _input()
+    filt = fir_design("bandpass", (0.05, 0.2), num_taps=301, method="auto")
+    whole = _one_shot(filt, x)
+    for size in CHUNK_SIZES[2:]:
+        assert np.allclose(_chunked(filt, x, size), whole, rtol=0, atol=1e-10), f"chunk size {size}"
+
+
+def test_biquad_chunked_matches_one_shot():
+    x = _input()
+    sections = [biquad_design("lowpass", 0.05).sections[0].coefficients,
+                biquad_design("notch", 0.2, q=5).sections[0].coefficients]
+    filt = BiquadFilter(sections)
+    whole = _one_shot(filt, x)
+    assert np.allclose(whole[:2000], _reference_biquads(sections, x[:2000]), rtol=0, atol=1e-9)
+    for size in CHUNK_SIZES:
+        assert np.allclose(_chunked(filt, x, size), whole, rtol=0, atol=1e-9), f"chunk size {size}"
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
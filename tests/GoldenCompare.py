@@ -0,0 +1,208 @@
+"""
+    Golden file comparison :
+
+    Vectorized counterpart of the line by line readers and sample loops of
+    Task1Test.py / Task2Test.py. Expected and actual signals are loaded in bulk
+    (fileHandling.load_signal) and compared as arrays with an absolute and a
+    relative tolerance, a sample passes when
+        |actual - expected| <= atol + rtol * |expected|
+    (atol=0.01, rtol=0 reproduce the Task tests). A failed comparison reports
+    its first max_mismatches mismatching samples with their indices.
+    Many pairs are compared in parallel on a process pool.
+
+        python tests/GoldenCompare.py                       # built-in suite (outputs/, sin_cos/)
+        python tests/GoldenCompare.py expected.txt actual.txt [expected2 actual2 ...]
+        python tests/GoldenCompare.py --atol 1e-6 --rtol 1e-9 -n 5 -j 8 ...
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from signals import Signal, generate_signal
+from fileHandling import load_signal
+from operations import (
+    add_signals,
+    subtract_signals,
+    multiply_signal_byConst,
+    square_signal,
+    accumulate_signal,
+    normalize_signal
+)
+
+# name, expected file, operation, input files, extra argument (paths relative to the repo root)
+GOLDEN_SUITE = (
+    ("Signal1+Signal2", "outputs/Task1/Signal1+signal2.txt", "add",
+     ("Inputs/Signal1.txt", "Inputs/Signal2.txt"), None),
+    ("Signal1+Signal3", "outputs/Task1/signal1+signal3.txt", "add",
+     ("Inputs/Signal1.txt", "Inputs/signal3.txt"), None),
+    ("Signal1 x 5", "outputs/Task1/MultiplySignalByConstant-Signal1 - by 5.txt", "multiply",
+     ("Inputs/Signal1.txt",), 5),
+    ("Signal2 x 10", "outputs/Task1/MultiplySignalByConstant-signal2 - by 10.txt", "multiply",
+     ("Inputs/Signal2.txt",), 10),
+    # the subtraction outputs hold the second signal minus the first one
+    ("Signal1-Signal2", "outputs/Task2/signal1-signal2.txt", "subtract",
+     ("Inputs/Signal2.txt", "Inputs/Signal1.txt"), None),
+    ("Signal1-Signal3", "outputs/Task2/signal1-signal3.txt", "subtract",
+     ("Inputs/signal3.txt", "Inputs/Signal1.txt"), None),
+    ("Square Signal1", "outputs/Task2/Output squaring signal 1.txt", "square",
+     ("Inputs/Signal1.txt",), None),
+    ("Accumulate Signal1", "outputs/Task2/output accumulation for signal1.txt", "accumulate",
+     ("Inputs/Signal1.txt",), None),
+    ("Normalize Signal1 [-1, 1]", "outputs/Task2/normalize of signal 1 (from -1 to 1)-- output.txt",
+     "normalize", ("Inputs/Signal1.txt",), "-1_to_1"),
+    ("Normalize Signal2 [0, 1]", "outputs/Task2/normlize signal 2 (from 0 to 1 )-- output.txt",
+     "normalize", ("Inputs/Signal2.txt",), "0_to_1"),
+    ("Sine", "sin_cos/SinOutput.txt", "generate", ("sin_cos/inputs.txt",), None),
+    ("Cosine", "sin_cos/CosOutput.txt", "generate", ("sin_cos/cos.txt",), None),
+)
+
+
+def _as_arrays(signal) -> tuple:
+    """(x, y) of a Signal, a file path or an (x, y) pair."""
+    if isinstance(signal, str):
+        signal = load_signal(signal)
+    if isinstance(signal, Signal):
+        return np.asarray(signal.shared_x()[:signal.size()]), signal.y
+    x, y = signal
+    return np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+
+
+def compare_signals(expected, actual, atol: float = 0.01, rtol: float = 0.0,
+                    max_mismatches: int = 10, check_indices: bool = True) -> dict:
+    """
+    Compare two signals (Signals, file paths or (x, y) pairs) sample by sample.
+    Returns {"passed", "reason", "n_samples", "n_mismatches", "max_abs_diff", "mismatches"},
+    mismatches holding up to max_mismatches (index, x, expected, actual) tuples.
+    """
+    ex, ey = _as_arrays(expected)
+    ax, ay = _as_arrays(actual)
+    result = {"passed": False, "reason": None, "n_samples": len(ey), "n_mismatches": 0,
+              "max_abs_diff": None, "mismatches": []}
+
+    if len(ey) != len(ay):
+        result["reason"] = f"different length: expected {len(ey)} samples, got {len(ay)}"
+        return result
+    if check_indices and not np.array_equal(ex, ax):
+        bad = np.flatnonzero(ex != ax)
+        result["n_mismatches"] = len(bad)
+        result["reason"] = "different indices"
+        result["mismatches"] = [(int(i), float(ex[i]), float(ex[i]), float(ax[i]))
+                                for i in bad[:max_mismatches]]
+        return result
+
+    diff = np.abs(ay - ey)
+    bad = np.flatnonzero(~(diff <= atol + rtol * np.abs(ey)))  # NaNs count as mismatches
+    result["max_abs_diff"] = float(np.max(diff)) if len(diff) else 0.0
+    result["n_mismatches"] = len(bad)
+    if len(bad):
+        result["reason"] = "different values"
+        result["mismatches"] = [(int(i), float(ex[i]), float(ey[i]), float(ay[i]))
+                                for i in bad[:max_mismatches]]
+        return result
+    result["passed"] = True
+    return result
+
+
+def _compute(op: str, inputs: tuple, arg) -> Signal:
+    """Actual signal of a suite entry."""
+    paths = [os.path.join(ROOT, p) for p in inputs]
+    if op == "generate":
+        return generate_signal(paths[0])
+    signals = [load_signal(p) for p in paths]
+    if op == "add":
+        return add_signals(*signals)
+    if op == "subtract":
+        return subtract_signals(*signals)
+    if op == "multiply":
+        return multiply_signal_byConst(signals[0], arg)
+    if op == "square":
+        return square_signal(signals[0])
+    if op == "accumulate":
+        return accumulate_signal(signals[0])
+    if op == "normalize":
+        return normalize_signal(signals[0], mode=arg)
+    raise ValueError(f"Unknown operation '{op}'")
+
+
+def _run_case(case: tuple, options: dict) -> dict:
+    """Worker: one comparison, (name, expected, actual) or a GOLDEN_SUITE entry."""
+    name, expected = case[0], case[1]
+    try:
+        if len(case) == 3:
+            actual = case[2]
+        else:
+            actual = _compute(*case[2:])
+            expected = os.path.join(ROOT, expected)
+        result = compare_signals(expected, actual, **options)
+    except Exception as e:  # a broken file fails its case, not the run
+        result = {"passed": False, "reason": f"{type(e).__name__}: {e}", "n_samples": 0,
+                  "n_mismatches": 0, "max_abs_diff": None, "mismatches": []}
+    result["name"] = name
+    return result
+
+
+def run_comparisons(cases, workers: int = None, atol: float = 0.01, rtol: float = 0.0,
+                    max_mismatches: int = 10, check_indices: bool = True) -> list:
+    """
+    Run many comparisons, each case being (name, expected path, actual path) or a
+    GOLDEN_SUITE entry. Results come back in the order of cases.
+    """
+    cases = list(cases)
+    options = {"atol": atol, "rtol": rtol, "max_mismatches": max_mismatches,
+               "check_indices": check_indices}
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(cases) <= 1:
+        return [_run_case(c, options) for c in cases]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_case, cases, [options] * len(cases),
+                             chunksize=max(1, len(cases) // (4 * workers))))
+
+
+def format_results(results: list) -> str:
+    lines = []
+    for r in results:
+        if r["passed"]:
+            lines.append(f"{r['name']} Test case passed successfully")
+            continue
+        lines.append(f"{r['name']} Test case failed, {r['reason']}"
+                     + (f" ({r['n_mismatches']} samples)" if r["n_mismatches"] else ""))
+        for index, x, expected, actual in r["mismatches"]:
+            lines.append(f"    [{index}] x={x:g}: expected {expected!r}, got {actual!r}")
+    failed = sum(not r["passed"] for r in results)
+    lines.append(f"{len(results) - failed} passed, {failed} failed")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare signals against golden files.")
+    parser.add_argument("files", nargs="*", help="expected / actual file pairs (default: the built-in suite)")
+    parser.add_argument("--atol", type=float, default=0.01)
+    parser.add_argument("--rtol", type=float, default=0.0)
+    parser.add_argument("-n", "--max-mismatches", type=int, default=10)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--no-indices", action="store_true", help="compare the samples only")
+    args = parser.parse_args(argv)
+
+    if len(args.files) % 2:
+        parser.error("files must come in expected / actual pairs")
+    if args.files:
+        cases = [(f"{e} vs {a}", e, a) for e, a in zip(args.files[::2], args.files[1::2])]
+    else:
+        cases = GOLDEN_SUITE
+
+    start = time.perf_counter()
+    results = run_comparisons(cases, args.workers, args.atol, args.rtol,
+                              args.max_mismatches, not args.no_indices)
+    print(format_results(results))
+    print(f"Elapsed: {time.perf_counter() - start:.3f} s")
+    return 0 if all(r["passed"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
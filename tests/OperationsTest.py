@@ -0,0 +1,161 @@
+"""
+    Operations checks :
+
+    Binary operations of operations.py on implicit (UniformAxis) and explicit
+    x axes, and the chunked Accumulator / Normalizer against their one-shot
+    counterparts. Runnable directly or with pytest:
+
+        python tests/OperationsTest.py
+        python -m pytest tests/OperationsTest.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from signals import Signal, UniformAxis
+from operations import (Accumulator, Normalizer, accumulate_signal, add_signals, normalize_signal,
+                        scan_bounds, subtract_signals)
+
+
+def test_mixed_axes_keep_the_implicit_axis():
+    implicit = Signal(x=UniformAxis(0, 1, 5), y=np.ones(5))
+    explicit = Signal(x=np.arange(5.0), y=np.arange(5.0))
+    for align in (None, "outer"):
+        assert np.array_equal(add_signals(implicit, explicit, align=align).y, np.arange(1.0, 6.0))
+        assert np.array_equal(subtract_signals(explicit, implicit, align=align).y, np.arange(-1.0, 4.0))
+        assert implicit._x is None, f"align={align} cached the expanded axis"
+
+
+def _pair(step: float, explicit: bool) -> tuple:
+    """Signals of 10 ones from 0 and of 10 twos from 3 * step, on implicit or explicit axes."""
+    def axis(start):
+        return start + step * np.arange(10) if explicit else UniformAxis(start, step, 10)
+    return (Signal(x=axis(0.0), y=np.ones(10)), Signal(x=axis(3 * step), y=np.full(10, 2.0)))
+
+
+# how -> (first x as a multiple of the step, y)
+_ALIGNED = {
+    "outer": (0, [1, 1, 1, 3, 3, 3, 3, 3, 3, 3, 2, 2, 2]),
+    "inner": (3, [3] * 7),
+    "left": (0, [1, 1, 1] + [3] * 7),
+}
+
+
+def test_aligned_add_on_every_axis_kind():
+    for step in (1.0, 0.1):  # 0.1: 3 * 0.1 != 0.3, the grids only match within a tolerance
+        for explicit in (False, True):
+            a, b = _pair(step, explicit)
+            for how, (first, y) in _ALIGNED.items():
+                case = f"step={step} explicit={explicit} align={how}"
+                result = add_signals(a, b, align=how)
+                assert isinstance(result.shared_x(), UniformAxis) != explicit, case
+                assert np.array_equal(result.y, y), case
+                assert np.allclose(result.x, (first + np.arange(len(y))) * step), case
+                assert np.all(np.diff(result.x) > 0), case
+
+
+def test_aligned_add_of_mixed_axes():
+    a, _ = _pair(0.1, explicit=False)
+    _, b = _pair(0.1, explicit=True)
+    for how, (first, y) in _ALIGNED.items():
+        assert np.array_equal(add_signals(a, b, align=how).y, y), how
+
+
+def test_aligned_subtract():
+    a, b = _pair(0.1, explicit=False)
+    assert np.array_equal(subtract_signals(a, b, align="outer").y,
+                          [1, 1, 1, -1, -1, -1, -1, -1, -1, -1, -2, -2, -2])
+    assert np.array_equal(subtract_signals(b, a, align="left").y, [1] * 7 + [2] * 3)
+
+
+def test_aligned_add_off_grid():
+    a = Signal(x=UniformAxis(0, 1, 3), y=np.ones(3))
+    b = Signal(x=UniformAxis(0.5, 1, 3), y=np.full(3, 2.0))
+    outer = add_signals(a, b, align="outer")
+    assert np.array_equal(outer.x, [0, 0.5, 1, 1.5, 2, 2.5])
+    assert np.array_equal(outer.y, [1, 2, 1, 2, 1, 2])
+    assert add_signals(a, b, align="inner").size() == 0
+    assert np.array_equal(add_signals(a, b, align="left").y, [1, 1, 1])
+
+
+CHUNK_SIZES = (1, 7, 1000, 4096, 10000)
+
+
+def _chunks(signal: Signal, size: int) -> list:
+    """Consecutive chunks of size samples of a signal with an implicit axis."""
+    axis, chunks = signal.axis, []
+    for i in range(0, signal.size(), size):
+        y = signal.y[i:i + size]
+        chunks.append(Signal(name=signal.name, x=UniformAxis(axis.start + i * axis.step, axis.step, len(y)), y=y))
+    return chunks
+
+
+def _long_signal(dtype=np.float64) -> Signal:
+    y = np.random.default_rng(0).standard_normal(10000).astype(dtype) + 0.1
+    return Signal(name="s", x=UniformAxis(-20, 0.5, len(y)), y=y)
+
+
+def test_chunked_accumulate_is_bit_identical():
+    for dtype in (np.float64, np.float32):
+        signal = _long_signal(dtype)
+        whole = accumulate_signal(signal)
+        for size in CHUNK_SIZES:
+            acc = Accumulator()
+            parts = [acc.process(c) for c in _chunks(signal, size)]
+            assert np.array_equal(np.concatenate([p.y for p in parts]), whole.y), (np.dtype(dtype), size)
+            assert np.array_equal(np.concatenate([p.x for p in parts]), whole.x)
+            assert all(p.y.dtype == dtype for p in parts)
+            acc.reset()
+            assert np.array_equal(acc.process(_chunks(signal, size)[0]).y, whole.y[:size])
+
+
+def test_two_pass_normalize_is_bit_identical():
+    signal = _long_signal()
+    for mode in ("-1_to_1", "0_to_1"):
+        whole = normalize_signal(signal, mode)
+        for size in CHUNK_SIZES:
+            chunks = _chunks(signal, size)
+            norm = Normalizer(mode, bounds=scan_bounds(chunks))
+            y = np.concatenate([norm.process(c).y for c in chunks])
+            assert np.array_equal(y, whole.y), (mode, size)
+
+
+def test_online_normalize():
+    # once the first chunk holds the global extremes, online equals the global normalization
+    y = np.random.default_rng(1).uniform(-1, 1, 10000)
+    y[:2] = -5, 5
+    signal = Signal(x=UniformAxis(0, 1, len(y)), y=y)
+    norm = Normalizer("0_to_1")
+    online = np.concatenate([norm.process(c).y for c in _chunks(signal, 1000)])
+    assert np.array_equal(online, normalize_signal(signal, "0_to_1").y)
+
+    # a constant start maps to the middle of the range until the bounds open up
+    flat = Signal(x=UniformAxis(0, 1, 4), y=[2.0, 2.0, 1.0, 3.0])
+    norm = Normalizer("-1_to_1")
+    assert np.array_equal(np.concatenate([norm.process(c).y for c in _chunks(flat, 2)]), [0, 0, -1, 1])
+    try:
+        Normalizer(bounds=(1.0, 1.0))
+    except ValueError:
+        return
+    raise AssertionError("constant bounds accepted")
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+    Parse cache checks :
+
+    Hits, invalidation and LRU eviction of parseCache.ParseCache. Runnable
+    directly or with pytest:
+
+        python tests/ParseCacheTest.py
+        python -m pytest tests/ParseCacheTest.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from fileHandling import load_signal
+from parseCache import ParseCache
+
+
+def _write_signal(path: str, y, mtime_ns: int = None):
+    with open(path, 'w') as f:
+        f.write(f"0\n0\n{len(y)}\n" + "".join(f"{i} {v}\n" for i, v in enumerate(y)))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class _Dirs:
+    """A source directory and a cache directory, removed on exit."""
+
+    def __enter__(self):
+        self.src, self.cache = tempfile.mkdtemp(), tempfile.mkdtemp()
+        return self
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.src)
+        shutil.rmtree(self.cache)
+
+
+def test_second_load_is_a_hit():
+    with _Dirs() as d:
+        path = os.path.join(d.src, "a.txt")
+        _write_signal(path, [1.5, 2.5, 3.5])
+        cache = ParseCache(d.cache)
+        assert cache.get(path) is None
+        first = load_signal(path, cache=cache)
+        cached = cache.get(path)
+        assert cached is not None and isinstance(cached.y, np.memmap)
+        assert cached.name == "a.txt"
+        second = load_signal(path, cache=cache)
+        assert np.array_equal(second.y, first.y) and np.array_equal(second.x, first.x)
+
+
+def test_changed_file_is_a_miss():
+    with _Dirs() as d:
+        path = os.path.join(d.src, "a.txt")
+        _write_signal(path, [1.0, 2.0], mtime_ns=10 ** 18)
+        cache = ParseCache(d.cache)
+        load_signal(path, cache=cache)
+        _write_signal(path, [7.0, 8.0], mtime_ns=2 * 10 ** 18)
+        assert cache.get(path) is None
+        assert np.array_equal(load_signal(path, cache=cache).y, [7.0, 8.0])
+        assert len(os.listdir(d.cache)) == 1  # the old version was replaced
+
+
+def test_content_hash_sees_same_size_and_mtime_edits():
+    with _Dirs() as d:
+        path = os.path.join(d.src, "a.txt")
+        plain = ParseCache(os.path.join(d.cache, "plain"))
+        hashed = ParseCache(os.path.join(d.cache, "hash"), use_hash=True)
+        _write_signal(path, [1.0, 2.0], mtime_ns=10 ** 18)
+        load_signal(path, cache=plain)
+        load_signal(path, cache=hashed)
+        _write_signal(path, [3.0, 4.0], mtime_ns=10 ** 18)  # same size, same timestamp
+        assert np.array_equal(load_signal(path, cache=plain).y, [1.0, 2.0])
+        assert np.array_equal(load_signal(path, cache=hashed).y, [3.0, 4.0])
+
+
+def test_unreadable_entry_is_a_miss():
+    with _Dirs() as d:
+        path = os.path.join(d.src, "a.txt")
+        _write_signal(path, [1.0, 2.0])
+        cache = ParseCache(d.cache)
+        load_signal(path, cache=cache)
+        _, entry = cache._key(path)
+        with open(entry, 'wb') as f:
+            f.write(b"not a signal")
+        assert cache.get(path) is None
+        assert np.array_equal(load_signal(path, cache=cache).y, [1.0, 2.0])
+
+
+def test_least_recently_used_entries_are_evicted():
+    with _Dirs() as d:
+        paths = [os.path.join(d.src, f"{i}.txt") for i in range(4)]
+        for path in paths:
+            _write_signal(path, np.arange(1000.0))
+        cache = ParseCache(d.cache)
+        for i, path in enumerate(paths[:3]):
+            load_signal(path, cache=cache)
+            _, entry = cache._key(path)
+            os.utime(entry, (1000 + i, 1000 + i))  # distinct last uses, whatever the clock resolution
+        entry_size = cache.size() // 3
+        cache.get(paths[0])  # now the most recently used one
+        cache.max_bytes = 3 * entry_size
+        load_signal(paths[3], cache=cache)
+        assert cache.size() <= cache.max_bytes
+        assert cache.get(paths[1]) is None
+        assert all(cache.get(p) is not None for p in (paths[0], paths[2], paths[3]))
+        cache.clear()
+        assert cache.size() == 0
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
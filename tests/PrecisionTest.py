@@ -0,0 +1,64 @@
+"""
+    Precision policy checks :
+
+    Sample and index dtypes of signals.py, per Signal and process-wide
+    (set_default_dtype / set_index_dtype). Runnable directly or with pytest:
+
+        python tests/PrecisionTest.py
+        python -m pytest tests/PrecisionTest.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from signals import Signal, UniformAxis, detect_period, set_index_dtype, validate_is_periodic
+
+
+def test_per_signal_index_dtype():
+    assert Signal(x=[0, 1, 2], y=[1, 2, 3], index_dtype=np.int64).x.dtype == np.int64
+    assert Signal(x=np.arange(3.0), y=[1, 2, 3], index_dtype=np.float32).x.dtype == np.float32
+    assert Signal(x=[0, 1, 2], y=[1, 2, 3]).x.dtype == np.float64
+
+
+def test_process_wide_index_dtype():
+    previous = set_index_dtype(np.int32)
+    try:
+        signal = Signal(x=[0, 1, 2], y=[1, 2, 3])
+        assert signal.x.dtype == np.int32
+        signal.x = [3, 4, 5]
+        assert signal.x.dtype == np.int32
+        # an explicit per-Signal dtype wins over the process-wide one
+        assert Signal(x=[0, 1, 2], y=[1, 2, 3], index_dtype=np.float32).x.dtype == np.float32
+    finally:
+        set_index_dtype(previous)
+
+
+def test_float32_period_is_detected():
+    rng = np.random.default_rng(0)
+    for period in (7, 100):
+        y = np.tile(rng.standard_normal(period), 4000 // period + 1)[:4000]
+        for dtype in (np.float64, np.float32):
+            signal = Signal(x=UniformAxis(0, 1, len(y)), y=y.astype(dtype))
+            assert detect_period(signal) == period, f"period {period} in {np.dtype(dtype)}"
+            assert validate_is_periodic(signal)
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+    Signal batch checks :
+
+    Every SignalBatch operation must give, channel by channel, the result of
+    the matching per-Signal function of operations.py. Runnable directly or
+    with pytest:
+
+        python tests/SignalBatchTest.py
+        python -m pytest tests/SignalBatchTest.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from signals import Signal, UniformAxis
+from signalBatch import SignalBatch
+from operations import (accumulate_signal, add_signals, multiply_signal_byConst, normalize_signal,
+                        square_signal, subtract_signals)
+
+N_CHANNELS, N_SAMPLES = 5, 3000
+
+
+def _signals(dtype=np.float64, x=None) -> list:
+    rng = np.random.default_rng(0)
+    x = UniformAxis(-10, 0.25, N_SAMPLES) if x is None else x
+    return [Signal(name=f"ch{i}", x=x, y=rng.standard_normal(N_SAMPLES).astype(dtype), is_periodic=i == 1)
+            for i in range(N_CHANNELS)]
+
+
+def _check(batch: SignalBatch, expected: list):
+    assert len(batch) == len(expected)
+    for got, want in zip(batch, expected):
+        assert got.y.dtype == want.y.dtype, want.name
+        assert np.array_equal(got.y, want.y), want.name
+        assert np.array_equal(got.x, want.x) and got.is_periodic == want.is_periodic, want.name
+
+
+def test_operations_match_per_signal():
+    for dtype in (np.float64, np.float32):
+        signals = _signals(dtype)
+        other = _signals(dtype)[::-1]
+        batch, other_batch = SignalBatch.from_signals(signals), SignalBatch.from_signals(other)
+        _check(batch + other_batch, [add_signals(a, b) for a, b in zip(signals, other)])
+        _check(batch - other_batch, [subtract_signals(a, b) for a, b in zip(signals, other)])
+        _check(batch * 2.5, [multiply_signal_byConst(s, 2.5) for s in signals])
+        _check(batch.square(), [square_signal(s) for s in signals])
+        _check(batch.accumulate(), [accumulate_signal(s) for s in signals])
+        for mode in ("-1_to_1", "0_to_1"):
+            normalized = batch.normalize(mode)
+            _check(normalized, [normalize_signal(s, mode) for s in signals])
+            assert normalized.names == [normalize_signal(s, mode).name for s in signals]
+
+
+def test_broadcasting():
+    signals = _signals()
+    reference = _signals()[2]
+    batch = SignalBatch.from_signals(signals)
+    _check(batch.subtract(reference), [subtract_signals(s, reference) for s in signals])
+    consts = np.arange(1.0, N_CHANNELS + 1)
+    _check(batch.multiply(consts), [multiply_signal_byConst(s, c) for s, c in zip(signals, consts)])
+
+
+def test_reductions():
+    signals = _signals()
+    batch = SignalBatch.from_signals(signals)
+    total = batch.sum()
+    assert np.allclose(total.y, add_signals(*signals).y, rtol=0, atol=1e-12)
+    assert total.is_periodic and total.shared_x() is batch.x
+    stacked = np.array([s.y for s in signals])
+    assert np.allclose(batch.mean().y, stacked.mean(axis=0))
+    assert np.array_equal(batch.min().y, stacked.min(axis=0))
+    assert np.array_equal(batch.max().y, stacked.max(axis=0))
+
+
+def test_channels_view_the_batch():
+    batch = SignalBatch.from_signals(_signals(x=np.linspace(0, 1, N_SAMPLES)))
+    first = batch.channel(0)
+    first.y[0] = 42.0
+    assert batch.data[0, 0] == 42.0
+    subset = batch[1:3]
+    assert isinstance(subset, SignalBatch) and subset.names == ["ch1", "ch2"]
+    assert list(subset.is_periodic) == [True, False]
+    assert batch[-1].name == "ch4"
+
+
+def test_mismatched_inputs_raise():
+    signals = _signals()
+    batch = SignalBatch.from_signals(signals)
+    shifted = Signal(x=UniformAxis(0, 0.25, N_SAMPLES), y=signals[0].y)
+    for build in (lambda: batch + shifted,
+                  lambda: SignalBatch.from_signals(signals + [shifted]),
+                  lambda: batch.multiply([1.0, 2.0]),
+                  lambda: batch[:2] + batch):
+        try:
+            build()
+        except ValueError:
+            continue
+        raise AssertionError("mismatched operands accepted")
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+    Signal checks :
+
+    Periodicity detection (detect_period) and domain conversion (to_frequency /
+    to_time) of signals.py. Runnable directly or with pytest:
+
+        python tests/SignalsTest.py
+        python -m pytest tests/SignalsTest.py
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "framework"))  # the framework modules import each other flat
+
+import numpy as np
+from signals import Signal, UniformAxis, detect_period, validate_is_periodic
+from fileHandling import load_signal, save_signal
+
+
+def _signal(y) -> Signal:
+    return Signal(x=UniformAxis(0, 1, len(y)), y=y)
+
+
+def test_period_of_repeated_pattern():
+    rng = np.random.default_rng(0)
+    for period in (1, 2, 7, 100, 500):
+        y = np.tile(rng.standard_normal(period), 1000 // period + 1)[:1000]
+        assert detect_period(_signal(y)) == period, period
+
+
+def test_period_of_sampled_sinusoid():
+    n = np.arange(1000)
+    assert detect_period(_signal(np.sin(2 * np.pi * n / 20))) == 20
+    # 3 cycles every 40 samples: the fundamental is 40, not 40 / 3
+    assert detect_period(_signal(np.cos(2 * np.pi * 3 * n / 40) + 5)) == 40
+
+
+def test_period_within_tolerance():
+    rng = np.random.default_rng(1)
+    y = np.tile(rng.standard_normal(13), 80)
+    noisy = y + rng.uniform(-1e-8, 1e-8, len(y))
+    assert detect_period(_signal(noisy)) == 13
+    assert detect_period(_signal(noisy), tol=1e-10) is None
+
+
+def test_aperiodic_signals():
+    rng = np.random.default_rng(2)
+    assert detect_period(_signal(rng.standard_normal(1000))) is None
+    assert not validate_is_periodic(_signal(np.arange(100.0)))
+    # a pattern seen less than twice is not a period
+    y = np.tile(rng.standard_normal(60), 2)[:100]
+    assert detect_period(_signal(y)) is None
+    assert detect_period(_signal([1.0])) is None
+
+
+def test_float32_load_detects_period():
+    y = np.tile(np.random.default_rng(3).standard_normal(7), 300).astype(np.float32)
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        save_signal(Signal(x=UniformAxis(0, 1, len(y)), y=y), path, int_index=True)
+        for dtype in (np.float64, np.float32):
+            signal = load_signal(path, dtype=dtype, detect_periodicity=True)
+            assert signal.is_periodic and signal.period == 7, np.dtype(dtype)
+    finally:
+        os.remove(path)
+
+
+def test_to_frequency_matches_the_dft():
+    for n in (1, 2, 15, 16):
+        y = np.random.default_rng(n).standard_normal(n)
+        spectrum = _signal(y).to_frequency()
+        expected = np.fft.fft(y)
+        assert spectrum.signal_type == 1 and spectrum.size() == n
+        assert np.allclose(spectrum.y, np.abs(expected), atol=1e-12), n
+        assert np.allclose(spectrum.y * np.exp(1j * spectrum.phase), expected, atol=1e-12), n
+
+
+def test_round_trip_keeps_the_time_axis():
+    y = np.random.default_rng(4).standard_normal(101)
+    for x in (UniformAxis(-5, 1, 101), np.linspace(0.5, 10.5, 101)):
+        back = Signal(x=x, y=y, sample_rate=8000).to_frequency().to_time()
+        assert np.allclose(back.y, y, atol=1e-12)
+        assert np.allclose(back.x, np.asarray(x[:]))
+
+
+def test_round_trip_through_a_binary_file():
+    y = np.random.default_rng(5).standard_normal(64)
+    fd, path = tempfile.mkstemp(suffix=".dsig")
+    os.close(fd)
+    try:
+        save_signal(Signal(x=UniformAxis(-5, 1, 64), y=y).to_frequency(), path)
+        back = load_signal(path).to_time()
+        assert back.x[0] == -5 and np.allclose(back.y, y, atol=1e-12)
+    finally:
+        os.remove(path)
+
+
+def test_uneven_axis_has_no_dft():
+    try:
+        Signal(x=[0, 1, 3, 4], y=[1, 2, 3, 4]).to_frequency()
+    except ValueError:
+        return
+    raise AssertionError("to_frequency accepted an unevenly spaced x")
+
+
+def main() -> int:
+    failed = 0
+    for name, check in sorted(globals().items()):
+        if not name.startswith("test_"):
+            continue
+        try:
+            check()
+            print(f"{name} passed")
+        except AssertionError as e:
+            failed += 1
+            print(f"{name} FAILED: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# Task1Test.py / Task2Test.py are the course's interactive checkers, not pytest modules
+collect_ignore = ["Task1Test.py", "Task2Test.py"]